@@ -0,0 +1,80 @@
+import numpy as np
+
+CHANNEL_TYPES = ("AWGN",)
+
+
+def noise_seed_sequence(seed, snr_idx, worker=0, batch_idx=0):
+    """
+    Returns the SeedSequence of one (SNR point, worker, batch index) noise stream.
+
+    The stream is the node `SeedSequence(seed).spawn(...)[snr_idx].spawn(...)[worker]
+    .spawn(...)[batch_idx]` of the spawn tree of `channel.seed`; it is built directly from
+    its spawn key, so any process can derive any stream without replaying the spawns.
+    Runners that number batches globally within an SNR point pass worker=0, which makes
+    the noise independent of how batches are distributed over workers.
+    """
+    return np.random.SeedSequence(seed, spawn_key=(int(snr_idx), int(worker), int(batch_idx)))
+
+
+def noise_generator(seed, snr_idx, worker=0, batch_idx=0):
+    """
+    Returns an independent `numpy.random.Generator` for one noise stream.
+    """
+    return np.random.Generator(np.random.PCG64(noise_seed_sequence(seed, snr_idx, worker, batch_idx)))
+
+
+class AwgnChannel:
+    """
+    Complex AWGN channel with a reusable noise buffer.
+
+    Noise for a whole batch is drawn in one call into a preallocated complex128 block
+    (filled through its float64 view with `standard_normal(out=...)`) and scaled in place,
+    so steady-state simulation does not allocate per batch. The channel keeps one flat
+    block sized for the largest batch so far and hands out reshaped prefixes of it, so
+    varying batch sizes never hold more than one block.
+
+    Args:
+        seed (int): `channel.seed`, root of every noise stream.
+    """
+
+    def __init__(self, seed=42):
+        self.seed = seed
+        self._flat = None
+
+    def generator(self, snr_idx, worker=0, batch_idx=0):
+        return noise_generator(self.seed, snr_idx, worker, batch_idx)
+
+    def _buffer(self, shape):
+        size = int(np.prod(shape))
+        if self._flat is None or self._flat.size < size:
+            self._flat = None  # release the old block before allocating the larger one
+            self._flat = np.empty(size, dtype=np.complex128)
+        return self._flat[:size].reshape(shape)
+
+    def noise(self, rng, shape, noise_var, out=None):
+        """
+        Returns complex Gaussian noise of total variance `noise_var` (noise_var / 2 per
+        real dimension). Without `out`, the channel's buffer is reused, so the result is only
+        valid until the next call.
+        """
+        shape = tuple(shape)
+        if out is None:
+            out = self._buffer(shape)
+        rng.standard_normal(out=out.view(np.float64))
+        out *= np.sqrt(noise_var / 2)
+        return out
+
+    def transmit(self, symbols, noise_var, rng, out=None):
+        """
+        Returns symbols + noise, written into `out` (or the reusable buffer) in place.
+        """
+        out = self.noise(rng, symbols.shape, noise_var, out=out)
+        out += symbols
+        return out
+
+
+def channel_from_config(config_chn):
+    """
+    Returns the channel of a validated `channel` section.
+    """
+    return AwgnChannel(config_chn["seed"])
@@ -1,29 +1,200 @@
 import numpy as np
+from functools import lru_cache
+from src.utils.bits.packed_bits import PackedBits
+
+CRC_POLYS = {
+    0:  0x0,
+    1:  0x1,
+    2:  0x3,
+    3:  0x3,
+    4:  0x3,
+    5:  0x15,
+    6:  0x21,  # 5G
+    7:  0x09,
+    8:  0xD5,
+    9:  0x119,
+    10: 0x233,
+    11: 0x621,  # 5G
+    12: 0x80F,
+    13: 0x1CF5,
+    14: 0x202D,
+    15: 0x4599,
+    16: 0x1021,  # 5G
+    17: 0x1685B,
+    18: 0x23979,
+    19: 0x6FB57,
+    20: 0xB5827,
+    21: 0x102899,
+    22: 0x308FD3,
+    23: 0x540DF0,
+    24: 0xB2B117,  # 5G
+    25: 0x101690C,
+    26: 0x33C19EF,
+    27: 0x5E04635,
+    28: 0x91DC1E3,
+    29: 0x16DFBF51,
+    30: 0x2030B9C7,
+    31: 0x6C740B8D,
+    32: 0x04C11DB7,
+    40: 0x0004820009,
+    64: 0x000000000000001B
+}
+
+CRC_POLYS_5G = {
+    6:  0x21,  # 5G
+    11: 0x621,  # 5G
+    # 16: 0x1021,  # 5G
+    24: 0xB2B117,  # 5G
+}
+
 
 def hex_to_bin_list(hex_str):
     bin_str = bin(int(hex_str, 16))[2:]  # Convert hex to binary string
     return [int(bit) for bit in bin_str]  # Convert binary string to list of integers
 
-def crc_encode(vec_info, vec_info_crc, CRC_bin, len_k, preload_val=0):
-    vec_info_crc[:len_k] = vec_info
-    vec_info_crc[len_k:] = 0
 
-    if(preload_val == 1): #preload_val can be either 0 or 1
-        vec_info_crc[len_k:] = 1
+class CrcEngine:
+    """
+    Byte-wise table-driven CRC for an MSB-first generator polynomial.
+
+    The register is `width = max(len_r, 8)` bits wide so that polynomials shorter
+    than a byte can share the same 256-entry table walk; the result is shifted back
+    down to `len_r` bits at the end. Leading zero bits do not change a CRC with a
+    zero initial register, so messages are left-padded to a whole number of bytes.
+
+    `preload_val` follows `crc_encode`: the parity tail is filled with ones before
+    the division, which is the same as inverting the final remainder.
+    """
+
+    def __init__(self, len_r, poly, preload_val=0):
+        self.len_r = len_r
+        self.poly = poly
+        self.preload_val = preload_val
+        self.width = max(len_r, 8)
+        self.mask = (1 << self.width) - 1
+        self.xor_out = ((1 << len_r) - 1) if preload_val == 1 else 0
+        self.table = self._build_table()
+        self._table_list = self.table.tolist()
+
+    def _build_table(self):
+        shift = self.width - 8
+        poly_w = self.poly << (self.width - self.len_r)
+        top_bit = 1 << (self.width - 1)
+        table = np.zeros(256, dtype=np.uint64)
+        for byte in range(256):
+            reg = byte << shift
+            for _ in range(8):
+                reg = ((reg << 1) ^ poly_w) if reg & top_bit else (reg << 1)
+            table[byte] = reg & self.mask
+        return table
+
+    def remainder(self, vec_info):
+        """
+        Returns the CRC of one bit vector as an integer (MSB = first CRC bit).
+        """
+        if self.len_r == 0:
+            return 0
+        bits = np.asarray(vec_info, dtype=np.uint8)
+        pad = (-len(bits)) % 8
+        if pad:
+            bits = np.concatenate((np.zeros(pad, dtype=np.uint8), bits))
+        shift = self.width - 8
+        mask = self.mask
+        table = self._table_list
+        reg = 0
+        for byte in np.packbits(bits).tolist():
+            reg = ((reg << 8) & mask) ^ table[((reg >> shift) ^ byte) & 0xFF]
+        return (reg >> (self.width - self.len_r)) ^ self.xor_out
+
+    def compute(self, vec_info):
+        """
+        Returns the `len_r` CRC bits of one bit vector as a uint8 array.
+        """
+        reg = self.remainder(vec_info)
+        shifts = np.arange(self.len_r - 1, -1, -1, dtype=np.uint64)
+        return ((np.uint64(reg) >> shifts) & np.uint64(1)).astype(np.uint8)
+
+    def remainder_packed(self, packed, len_bits=None):
+        """
+        Returns the CRC of the first `len_bits` bits of every frame of a PackedBits batch
+        as a uint64 array, walking the table one packed byte per step for the whole batch.
+        """
+        len_bits = packed.len_bits if len_bits is None else len_bits
+        byte_view = packed.as_bytes()
+        reg = np.zeros(packed.shape, dtype=np.uint64)
+        if self.len_r == 0:
+            return reg
+        shift = np.uint64(self.width - 8)
+        mask = np.uint64(self.mask)
+        eight, one = np.uint64(8), np.uint64(1)
+        for j in range(len_bits // 8):
+            idx = ((reg >> shift) ^ byte_view[..., j]) & np.uint64(0xFF)
+            reg = ((reg << eight) & mask) ^ self.table[idx]
+        if len_bits % 8:
+            # Remaining bits of the last byte go through the bit-serial step.
+            tail = byte_view[..., len_bits // 8].astype(np.uint64)
+            top_shift = np.uint64(self.width - 1)
+            poly_w = np.uint64(self.poly << (self.width - self.len_r))
+            for t in range(len_bits % 8):
+                top = ((reg >> top_shift) ^ (tail >> np.uint64(7 - t))) & one
+                reg = ((reg << one) & mask) ^ (top * poly_w)
+        return (reg >> np.uint64(self.width - self.len_r)) ^ np.uint64(self.xor_out)
+
+
+@lru_cache(maxsize=None)
+def get_crc_engine(len_r, preload_val=0, standard="generic"):
+    """
+    Returns the cached table-driven engine for a CRC length.
+
+    Args:
+        len_r (int): CRC length.
+        preload_val (int): 0 or 1, see `crc_encode`.
+        standard (str): "generic" uses `instantiate_crcs`, "5g" uses `instantiate_crcs_5g`.
+
+    Returns:
+        CrcEngine: Engine with its lookup table already built.
+    """
+    if standard == "5g":
+        crc_poly, _ = instantiate_crcs_5g(len_r)
+    else:
+        crc_poly, _ = instantiate_crcs(len_r)
+    return CrcEngine(len_r, crc_poly, preload_val)
+
+
+def precompute_crc_tables():
+    """
+    Builds the lookup tables of every known polynomial up front, so that the first
+    frame of a simulation does not pay for table construction.
+    """
+    for len_r in CRC_POLYS:
+        for preload_val in (0, 1):
+            get_crc_engine(len_r, preload_val)
+    for len_r in CRC_POLYS_5G:
+        for preload_val in (0, 1):
+            get_crc_engine(len_r, preload_val, "5g")
+
 
-    # for idx, val in enumerate(vec_info_crc):
-    #     print(val, "/")
-    # print("\n")
+def crc_bin_to_poly(CRC_bin):
+    len_r = len(CRC_bin) - 1
+    return sum(int(CRC_bin[len_r - i]) << i for i in range(len_r))
+
+
+def crc_encode(vec_info, vec_info_crc, CRC_bin, len_k, preload_val=0):
+    len_r = len(CRC_bin) - 1
+    engine = _engine_for_bin(tuple(int(b) for b in CRC_bin), preload_val)
 
-    for i in range(len_k):
-        if vec_info_crc[i] != 0:
-            for j in range(len(CRC_bin)):
-                vec_info_crc[i + j] ^= CRC_bin[j]
-    
     vec_info_crc[:len_k] = vec_info
+    vec_info_crc[len_k:] = 1 if preload_val == 1 else 0
+    vec_info_crc[len_k:len_k + len_r] = engine.compute(vec_info_crc[:len_k])
 
     return vec_info_crc
 
+
+@lru_cache(maxsize=None)
+def _engine_for_bin(CRC_bin, preload_val):
+    return CrcEngine(len(CRC_bin) - 1, crc_bin_to_poly(CRC_bin), preload_val)
+
+
 def compute_crc_5g_polar(vec_info: list[int], len_r=24, prefill_val=0) -> list[int]:
     """
     Computes a CRC of length len_r using 5G-compliant polynomial and optional preload.
@@ -31,33 +202,23 @@ def compute_crc_5g_polar(vec_info: list[int], len_r=24, prefill_val=0) -> list[i
     Args:
         vec_info (list[int]): Information bits (0 or 1)
         len_r (int): CRC length, default is 24 (used in polar coding)
-        prefill_val (int): Preload value for CRC register (e.g., 0xFFFFFF for DCI)
+        prefill_val (int): Preload value for CRC register, 0 or 1 (1 fills the register with ones)
 
     Returns:
         list[int]: The CRC bits as a list of 0s and 1s
     """
-    _, crc_poly = instantiate_crcs_5g(len_r)
-    len_k = len(vec_info)
-    vec_info_crc = np.zeros(len_k + 24, dtype=int)
-    crc_encoded = crc_encode(vec_info, vec_info_crc, crc_poly, len_k, prefill_val)
-    return crc_encoded[len_k:].tolist()
+    engine = get_crc_engine(len_r, prefill_val, "5g")
+    return engine.compute(vec_info).tolist()
 
 
 def instantiate_crcs_5g(len_r):
     CRC_bin = [0] * (len_r + 1)
-    
-    crc_polys = {
-        6:  0x21,  # 5G
-        11: 0x621,  # 5G
-        # 16: 0x1021,  # 5G
-        24: 0xB2B117,  # 5G
-    }
-
-    if len_r not in crc_polys:
-        raise ValueError(f"Unsupported 5G CRC length: {len_r}. Valid options are {list(crc_polys.keys())}.")
-    
-    CRC_poly = crc_polys.get(len_r, 0)
-    
+
+    if len_r not in CRC_POLYS_5G:
+        raise ValueError(f"Unsupported 5G CRC length: {len_r}. Valid options are {list(CRC_POLYS_5G.keys())}.")
+
+    CRC_poly = CRC_POLYS_5G.get(len_r, 0)
+
     CRC_bin[0] = 1
     for i in range(len_r):
         CRC_bin[len_r - i] = (CRC_poly >> i) & 1
@@ -67,49 +228,148 @@ def instantiate_crcs_5g(len_r):
 
 def instantiate_crcs(len_r):
     CRC_bin = [0] * (len_r + 1)
-    
-    crc_polys = {
-        0:  0x0,
-        1:  0x1,
-        2:  0x3,
-        3:  0x3,
-        4:  0x3,
-        5:  0x15,
-        6:  0x21,  # 5G
-        7:  0x09,
-        8:  0xD5,
-        9:  0x119,
-        10: 0x233,
-        11: 0x621,  # 5G
-        12: 0x80F,
-        13: 0x1CF5,
-        14: 0x202D,
-        15: 0x4599,
-        16: 0x1021,  # 5G
-        17: 0x1685B,
-        18: 0x23979,
-        19: 0x6FB57,
-        20: 0xB5827,
-        21: 0x102899,
-        22: 0x308FD3,
-        23: 0x540DF0,
-        24: 0xB2B117,  # 5G
-        25: 0x101690C,
-        26: 0x33C19EF,
-        27: 0x5E04635,
-        28: 0x91DC1E3,
-        29: 0x16DFBF51,
-        30: 0x2030B9C7,
-        31: 0x6C740B8D,
-        32: 0x04C11DB7,
-        40: 0x0004820009,
-        64: 0x000000000000001B
-    }
-    
-    CRC_poly = crc_polys.get(len_r, 0)
-    
+
+    CRC_poly = CRC_POLYS.get(len_r, 0)
+
     CRC_bin[0] = 1
     for i in range(len_r):
         CRC_bin[len_r - i] = (CRC_poly >> i) & 1
 
-    return CRC_poly, CRC_bin
\ No newline at end of file
+    return CRC_poly, CRC_bin
+
+
+@lru_cache(maxsize=64)
+def _crc_parity_matrix(len_k, len_r, poly):
+    # Row i holds the CRC of the unit vector e_i, i.e. x^(len_k - 1 - i + len_r) mod g(x).
+    mat = np.zeros((len_k, len_r), dtype=np.float32)
+    if len_r == 0 or len_k == 0:
+        mat.setflags(write=False)
+        return mat
+    mask = (1 << len_r) - 1
+    top_bit = 1 << (len_r - 1)
+    shifts = range(len_r - 1, -1, -1)
+    rem = poly & mask
+    for j in range(len_k):
+        mat[len_k - 1 - j] = [(rem >> s) & 1 for s in shifts]
+        rem = (((rem << 1) & mask) ^ poly) if rem & top_bit else ((rem << 1) & mask)
+    mat.setflags(write=False)
+    return mat
+
+
+def crc_parity_matrix(len_k, len_r, standard="generic"):
+    """
+    Returns the cached GF(2) parity matrix P of shape (len_k, len_r) such that
+    `crc = info @ P mod 2` for a zero preload. The matrix is stored as float32 so
+    that the product runs through BLAS; sums stay exact up to 2^24 information bits.
+    """
+    if standard == "5g":
+        crc_poly, _ = instantiate_crcs_5g(len_r)
+    else:
+        crc_poly, _ = instantiate_crcs(len_r)
+    return _crc_parity_matrix(len_k, len_r, crc_poly)
+
+
+def _gf2_matmul(bits, mat):
+    prod = np.asarray(bits, dtype=np.float32) @ mat
+    return (prod.astype(np.int64) & 1).astype(np.uint8)
+
+
+def crc_compute_batch(vec_info, len_r, preload_val=0, standard="generic"):
+    """
+    Computes the CRC of every frame of a batch in one vectorized call.
+
+    Args:
+        vec_info (np.ndarray | PackedBits): Information bits of shape (..., len_k).
+        len_r (int): CRC length.
+        preload_val (int): 0 or 1, see `crc_encode`.
+        standard (str): "generic" or "5g" polynomial table.
+
+    Returns:
+        np.ndarray | PackedBits: CRC bits of shape (..., len_r), uint8 for unpacked
+        input and PackedBits for packed input.
+    """
+    if isinstance(vec_info, PackedBits):
+        reg = get_crc_engine(len_r, preload_val, standard).remainder_packed(vec_info)
+        return PackedBits.from_bits(_register_to_bits(reg, len_r), vec_info.words.dtype.type)
+    vec_info = np.asarray(vec_info)
+    mat = crc_parity_matrix(vec_info.shape[-1], len_r, standard)
+    parity = _gf2_matmul(vec_info, mat)
+    if preload_val == 1:
+        parity ^= 1
+    return parity
+
+
+def _register_to_bits(reg, len_r):
+    shifts = np.arange(len_r - 1, -1, -1, dtype=np.uint64)
+    return ((reg[..., None] >> shifts) & np.uint64(1)).astype(np.uint8)
+
+
+def crc_attach_batch(vec_info, len_r, preload_val=0, standard="generic", out=None):
+    """
+    Returns the (..., len_k + len_r) frames made of the information bits followed by their CRC.
+    """
+    if isinstance(vec_info, PackedBits):
+        len_k = vec_info.len_bits
+        word_dtype = vec_info.words.dtype.type
+        parity = crc_compute_batch(vec_info, len_r, preload_val, standard)
+        if len_k % 8:
+            bits = np.concatenate((vec_info.to_bits(), parity.to_bits()), axis=-1)
+            return PackedBits.from_bits(bits, word_dtype)
+        # Byte-aligned information: the CRC bytes are appended without unpacking.
+        out = PackedBits.zeros(vec_info.shape, len_k + len_r, word_dtype)
+        out_bytes, parity_bytes = out.as_bytes(), parity.as_bytes()[..., :-(-len_r // 8)]
+        out_bytes[..., :len_k // 8] = vec_info.as_bytes()[..., :len_k // 8]
+        out_bytes[..., len_k // 8:len_k // 8 + parity_bytes.shape[-1]] = parity_bytes
+        return out
+    vec_info = np.asarray(vec_info)
+    len_k = vec_info.shape[-1]
+    if out is None:
+        out = np.empty(vec_info.shape[:-1] + (len_k + len_r,), dtype=np.uint8)
+    out[..., :len_k] = vec_info
+    out[..., len_k:] = crc_compute_batch(vec_info, len_r, preload_val, standard)
+    return out
+
+
+def crc_syndrome_batch(vec_info_crc, len_k, len_r, preload_val=0, standard="generic"):
+    """
+    Returns the (..., len_r) CRC syndrome of (..., len_k + len_r) frames; all-zero means pass.
+
+    Any number of leading axes is accepted, so the candidates of an SC-List decoder,
+    shaped (batch, list_size, len_k + len_r), are checked in a single product.
+    PackedBits frames are checked with the table walk and give a PackedBits syndrome.
+    """
+    if isinstance(vec_info_crc, PackedBits):
+        engine = get_crc_engine(len_r, preload_val, standard)
+        reg = engine.remainder_packed(vec_info_crc, len_k)
+        received = vec_info_crc.take_bits(np.arange(len_k, len_k + len_r)).to_bits()
+        return PackedBits.from_bits(_register_to_bits(reg, len_r) ^ received)
+    vec_info_crc = np.asarray(vec_info_crc)
+    parity = crc_compute_batch(vec_info_crc[..., :len_k], len_r, preload_val, standard)
+    return parity ^ vec_info_crc[..., len_k:len_k + len_r].astype(np.uint8)
+
+
+def crc_check_batch(vec_info_crc, len_k, len_r, preload_val=0, standard="generic"):
+    """
+    Returns a boolean mask over the leading axes of `vec_info_crc` that is True where the CRC passes.
+    """
+    syndrome = crc_syndrome_batch(vec_info_crc, len_k, len_r, preload_val, standard)
+    if isinstance(syndrome, PackedBits):
+        return ~syndrome.any()
+    return ~syndrome.any(axis=-1)
+
+
+def crc_partial_syndrome(vec_info_part, len_k, len_r, start=0, standard="generic"):
+    """
+    Returns the contribution of the information bits [start, start + m) to the CRC of a
+    length-len_k message, with `vec_info_part` of shape (..., m).
+
+    Contributions of disjoint segments XOR together, so a list decoder can accumulate
+    the syndrome as bits are decided instead of recomputing it over the whole prefix.
+    The preload and the received CRC bits are applied by the caller at the end.
+    """
+    vec_info_part = np.asarray(vec_info_part)
+    stop = start + vec_info_part.shape[-1]
+    if start < 0 or stop > len_k:
+        raise ValueError(f"CRC segment [{start}, {stop}) is outside the {len_k} information bits.")
+    mat = crc_parity_matrix(len_k, len_r, standard)
+    return _gf2_matmul(vec_info_part, mat[start:stop])
@@ -0,0 +1,246 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+NODE_RATE0 = 0
+NODE_RATE1 = 1
+NODE_REP = 2
+NODE_SPC = 3
+NODE_NAMES = {NODE_RATE0: "rate0", NODE_RATE1: "rate1", NODE_REP: "rep", NODE_SPC: "spc"}
+
+_PLAN_ARRAYS = (
+    "rel_idx", "info_set", "data_pos", "crc_pos", "frozen_mask", "critical_set", "node_kind", "node_start", "node_size"
+)
+
+_PLAN_CACHE = {}
+
+
+class PolarCodePlan:
+    """
+    Every structure derived from a polar code that decoders and encoders need, built once.
+
+    Attributes:
+        key (str): Content hash of the reliability sequence, len_k, CRC and fast-node limits.
+        len_n, len_logn, len_k, len_r (int): Code length, its log2, information and CRC bits.
+        rel_idx (np.ndarray): Reliability sequence, most reliable index first.
+        info_set (np.ndarray): The len_k + len_r unfrozen positions in ascending order.
+        data_pos (np.ndarray): Positions of the information bits (first len_k of info_set).
+        crc_pos (np.ndarray): Positions of the CRC bits (last len_r of info_set).
+        frozen_mask (np.ndarray): True for frozen positions.
+        critical_set (np.ndarray): First bit of every maximal rate-1 subtree, in ascending
+            order; the flip candidates of SC-Flip decoding.
+        node_kind, node_start, node_size (np.ndarray): Fast-SSC node schedule in decoding
+            order. Without fast decoding every node is a single-bit rate0/rate1 leaf.
+
+    All arrays are read-only so a plan can be shared between decoders and processes.
+    """
+
+    def __init__(self, key, len_k, len_r, crc_poly, fast_max_size, arrays):
+        self.key = key
+        self.len_k = len_k
+        self.len_r = len_r
+        self.crc_poly = crc_poly
+        self.fast_max_size = dict(fast_max_size)
+        for name in _PLAN_ARRAYS:
+            arr = arrays[name]
+            if arr.flags.writeable:
+                arr.setflags(write=False)
+            setattr(self, name, arr)
+        self.len_n = len(self.rel_idx)
+        self.len_logn = int(self.len_n).bit_length() - 1
+        self.len_info = len_k + len_r
+        self._node_lookup = None
+
+    @property
+    def rate(self):
+        return self.len_k / self.len_n
+
+    @property
+    def node_lookup(self):
+        """
+        Dict (start, size) -> node kind for the scheduled nodes, built on first use.
+        """
+        if self._node_lookup is None:
+            self._node_lookup = {
+                (int(s), int(z)): int(k) for k, s, z in zip(self.node_kind, self.node_start, self.node_size)
+            }
+        return self._node_lookup
+
+    def save(self, directory):
+        """
+        Writes the plan as one `.npy` per array plus a JSON header, for `load_code_plan`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in _PLAN_ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        header = {
+            "key": self.key,
+            "len_k": self.len_k,
+            "len_r": self.len_r,
+            "crc_poly": self.crc_poly,
+            "fast_max_size": self.fast_max_size,
+        }
+        with open(os.path.join(directory, "plan.json"), "w") as f:
+            json.dump(header, f, indent=4)
+
+    def __repr__(self):
+        return f"PolarCodePlan(N={self.len_n}, K={self.len_k}, CRC={self.len_r}, nodes={len(self.node_kind)})"
+
+
+def load_code_plan(directory):
+    """
+    Loads a saved plan with every array memory-mapped read-only, so that several
+    processes can share the same pages.
+    """
+    with open(os.path.join(directory, "plan.json"), "r") as f:
+        header = json.load(f)
+    arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in _PLAN_ARRAYS}
+    return PolarCodePlan(
+        header["key"], header["len_k"], header["len_r"], header["crc_poly"], header["fast_max_size"], arrays
+    )
+
+
+def code_plan_key(rel_idx, len_k, len_r=0, crc_poly=0, fast_max_size=None):
+    """
+    Returns the content hash identifying a plan.
+    """
+    rel_idx = np.ascontiguousarray(rel_idx, dtype=np.int64)
+    limits = sorted((fast_max_size or {}).items())
+    h = hashlib.sha256(rel_idx.tobytes())
+    h.update(json.dumps([len_k, len_r, crc_poly, limits]).encode())
+    return h.hexdigest()[:32]
+
+
+def get_code_plan(rel_idx, len_k, len_r=0, crc_poly=0, fast_max_size=None, cache_dir=None):
+    """
+    Returns the memoized plan of a code, building it on the first request.
+
+    Args:
+        rel_idx (np.ndarray): Reliability sequence, most reliable index first.
+        len_k (int): Number of information bits.
+        len_r (int): Number of CRC bits (0 without CRC).
+        crc_poly (int): CRC polynomial, part of the key only.
+        fast_max_size (dict, optional): Largest node size per fast node type
+            ("rate0", "rate1", "rep", "spc"); missing or 0 disables a type.
+        cache_dir (str, optional): Directory where plans are saved and memory-mapped from.
+
+    Returns:
+        PolarCodePlan: The shared, read-only plan.
+    """
+    fast_max_size = {k: int(v) for k, v in (fast_max_size or {}).items() if k in NODE_NAMES.values()}
+    key = code_plan_key(rel_idx, len_k, len_r, crc_poly, fast_max_size)
+    plan = _PLAN_CACHE.get(key)
+    if plan is not None:
+        return plan
+
+    plan_dir = os.path.join(cache_dir, key) if cache_dir else None
+    if plan_dir and os.path.exists(os.path.join(plan_dir, "plan.json")):
+        plan = load_code_plan(plan_dir)
+    else:
+        plan = build_code_plan(key, rel_idx, len_k, len_r, crc_poly, fast_max_size)
+        if plan_dir:
+            plan.save(plan_dir)
+
+    _PLAN_CACHE[key] = plan
+    return plan
+
+
+def plan_from_config(config_code):
+    """
+    Returns the plan of a validated `code` config section.
+    """
+    polar = config_code["polar"]
+    crc = polar.get("crc", {})
+    len_r = crc["length"] if crc.get("enable", False) else 0
+    crc_poly = crc.get("poly", 0) if len_r else 0
+    fast_max_size = polar.get("fast_max_size", {}) if polar.get("fast_enable", False) else {}
+    return get_code_plan(polar["rel_idx"], config_code["len_k"], len_r, crc_poly, fast_max_size)
+
+
+def build_code_plan(key, rel_idx, len_k, len_r, crc_poly, fast_max_size):
+    rel_idx = np.array(rel_idx, dtype=np.int64)
+    len_n = len(rel_idx)
+    len_info = len_k + len_r
+    if len_info > len_n:
+        raise ValueError(f"len_k + CRC length ({len_k} + {len_r}) exceeds the code length {len_n}.")
+
+    info_set = np.sort(rel_idx[:len_info]).astype(np.int32)
+    frozen_mask = np.ones(len_n, dtype=np.bool_)
+    frozen_mask[info_set] = False
+
+    node_kind, node_start, node_size = build_node_schedule(frozen_mask, fast_max_size)
+
+    arrays = {
+        "rel_idx": rel_idx,
+        "info_set": info_set,
+        "data_pos": info_set[:len_k].copy(),
+        "crc_pos": info_set[len_k:].copy(),
+        "frozen_mask": frozen_mask,
+        "critical_set": build_critical_set(frozen_mask),
+        "node_kind": node_kind,
+        "node_start": node_start,
+        "node_size": node_size,
+    }
+    return PolarCodePlan(key, len_k, len_r, crc_poly, fast_max_size, arrays)
+
+
+def classify_node(frozen):
+    """
+    Returns the special node kind of a frozen pattern, or None.
+    """
+    n_info = len(frozen) - int(np.count_nonzero(frozen))
+    if n_info == 0:
+        return NODE_RATE0
+    if n_info == len(frozen):
+        return NODE_RATE1
+    if n_info == 1 and not frozen[-1]:
+        return NODE_REP
+    if n_info == len(frozen) - 1 and frozen[0]:
+        return NODE_SPC
+    return None
+
+
+def build_critical_set(frozen_mask):
+    """
+    Returns the first index of every maximal all-information (rate-1) subtree of the
+    decoding tree, where the first SC error of a frame is most likely to occur.
+    """
+    critical = []
+
+    def visit(start, size):
+        n_frozen = int(np.count_nonzero(frozen_mask[start:start + size]))
+        if n_frozen == size:
+            return
+        if n_frozen == 0:
+            critical.append(start)
+            return
+        visit(start, size // 2)
+        visit(start + size // 2, size // 2)
+
+    visit(0, len(frozen_mask))
+    return np.array(critical, dtype=np.int32)
+
+
+def build_node_schedule(frozen_mask, fast_max_size=None):
+    """
+    Splits the decoding tree into the largest special nodes allowed by `fast_max_size`.
+
+    Returns:
+        tuple: (node_kind int8, node_start int32, node_size int32) in decoding order.
+    """
+    limits = {kind: int((fast_max_size or {}).get(name, 0)) for kind, name in NODE_NAMES.items()}
+    kinds, starts, sizes = [], [], []
+
+    def visit(start, size):
+        kind = classify_node(frozen_mask[start:start + size])
+        if size == 1 or (kind is not None and size <= limits[kind]):
+            kinds.append(kind)
+            starts.append(start)
+            sizes.append(size)
+            return
+        visit(start, size // 2)
+        visit(start + size // 2, size // 2)
+
+    visit(0, len(frozen_mask))
+    return np.array(kinds, dtype=np.int8), np.array(starts, dtype=np.int32), np.array(sizes, dtype=np.int32)
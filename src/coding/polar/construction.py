@@ -0,0 +1,99 @@
+import os
+import numpy as np
+from functools import lru_cache
+from src.coding.polar.reliability import POLAR_LIB_DIR, register_reliability_sequence
+
+MAX_CONSTRUCTION_LOGN = 16  # the reliability store keeps indices as uint16
+
+_PHI_SPLIT = 10.0
+_BISECT_ITERS = 64
+
+
+def ga_file_name(len_n, design_snr_db):
+    """
+    Returns the library file name of a constructed sequence, e.g. `n1024_awgn_ga1.5dB.pc`.
+    """
+    return f"n{len_n}_awgn_ga{design_snr_db:g}dB.pc"
+
+
+def _log_phi(x):
+    # Chung's approximation of phi(x) = 1 - E[tanh(L/2)], L ~ N(x, 2x), in the log domain
+    # so that the large means of long codes do not underflow.
+    x = np.maximum(x, 1e-12)
+    x_small = np.minimum(x, _PHI_SPLIT)
+    x_large = np.maximum(x, _PHI_SPLIT)
+    small = -0.4527 * np.power(x_small, 0.86) + 0.0218
+    large = 0.5 * np.log(np.pi / x_large) - x_large / 4 + np.log1p(-10 / (7 * x_large))
+    return np.where(x < _PHI_SPLIT, small, large)
+
+
+def _check_node_mean(mean):
+    """
+    Returns phi^-1(1 - (1 - phi(m))^2) for a whole level of the polarization tree.
+    The inverse is a vectorized bisection on [0, m], since the check-node output never
+    exceeds its input mean.
+    """
+    log_phi = _log_phi(mean)
+    target = log_phi + np.log(2 - np.exp(log_phi))
+    lo = np.zeros_like(mean)
+    hi = mean.copy()
+    for _ in range(_BISECT_ITERS):
+        mid = 0.5 * (lo + hi)
+        above = _log_phi(mid) > target
+        lo = np.where(above, mid, lo)
+        hi = np.where(above, hi, mid)
+    return 0.5 * (lo + hi)
+
+
+def gaussian_approximation_means(len_n, design_snr_db):
+    """
+    Returns the mean LLR of every synthetic channel of a length-len_n polar code.
+
+    The channel is BPSK over AWGN at Es/N0 = design_snr_db, i.e. a mean channel LLR of
+    4 * 10^(snr / 10). Each level of the tree is computed with one check-node and one
+    variable-node operation over all of its channels; the children of channel j are
+    2j (check) and 2j + 1 (variable), matching the index convention of the library.
+    """
+    len_logn = int(len_n).bit_length() - 1
+    if len_n <= 0 or len_n != 1 << len_logn:
+        raise ValueError(f"Polar code length must be a power of 2, got {len_n}.")
+    if len_logn > MAX_CONSTRUCTION_LOGN:
+        raise ValueError(f"Polar code length must be at most 2^{MAX_CONSTRUCTION_LOGN}, got {len_n}.")
+
+    mean = np.array([4 * 10 ** (design_snr_db / 10)], dtype=np.float64)
+    for _ in range(len_logn):
+        level = np.empty(2 * len(mean), dtype=np.float64)
+        level[0::2] = _check_node_mean(mean)
+        level[1::2] = 2 * mean
+        mean = level
+    return mean
+
+
+@lru_cache(maxsize=32)
+def construct_polar_code(len_n, design_snr_db):
+    """
+    Returns the reliability sequence (most reliable first) of a Gaussian-approximation
+    construction. Cached per (len_n, design SNR); the array is read-only.
+    """
+    mean = gaussian_approximation_means(len_n, design_snr_db)
+    rel_idx = np.argsort(-mean, kind="stable").astype(np.int64)
+    rel_idx.setflags(write=False)
+    return rel_idx
+
+
+def write_polar_code(len_n, design_snr_db, directory=POLAR_LIB_DIR, register=True):
+    """
+    Constructs a code, writes it as a `.pc` file in the library ordering convention and,
+    by default, indexes it in the binary reliability store.
+
+    Returns:
+        str: Path of the written file.
+    """
+    rel_idx = construct_polar_code(len_n, design_snr_db)
+    filename = ga_file_name(len_n, design_snr_db)
+    filepath = os.path.join(directory, filename)
+    with open(filepath, "w") as f:
+        f.write(" ".join(str(i) for i in rel_idx) + " \n")
+    if register:
+        register_reliability_sequence(os.path.splitext(filename)[0], rel_idx, filename)
+    return filepath
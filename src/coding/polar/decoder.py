@@ -0,0 +1,50 @@
+from src.coding.polar.code_plan import plan_from_config
+from src.coding.polar.decoder_sc import SCDecoder
+from src.coding.polar.decoder_scl import SCLDecoder
+from src.coding.polar.decoder_scf import SCFlipDecoder
+from src.coding.polar.quantize import fixed_point_ops
+
+DECODER_ALGORITHMS = ("SC", "SC-List", "SC-Flip")
+
+
+def decoder_label(config_dec):
+    """
+    Short name of a validated decoder section, e.g. "SC-List(L=8)".
+    """
+    algorithm = config_dec["algorithm"]
+    if algorithm == "SC-List":
+        return f"SC-List(L={config_dec.get('list_size', 8)})"
+    if algorithm == "SC-Flip":
+        return f"SC-Flip(T={config_dec.get('flip_max_iters', 10)})"
+    return algorithm
+
+
+def build_decoder(config_code, plan=None, config_dec=None):
+    """
+    Returns the decoder selected by `polar.decoder.algorithm` of a validated `code` section.
+
+    Args:
+        config_code (dict): Validated `code` section.
+        plan (PolarCodePlan, optional): Plan to decode with, `plan_from_config` by default.
+        config_dec (dict, optional): Validated decoder section to use instead of `polar.decoder`,
+            e.g. one entry of `polar.decoders`.
+
+    Returns:
+        SCDecoder, SCLDecoder or SCFlipDecoder: All expose `decode(llr)` and `decode_info(llr)`.
+    """
+    polar = config_code["polar"]
+    if plan is None:
+        plan = plan_from_config(config_code)
+    if config_dec is None:
+        config_dec = polar.get("decoder", {"algorithm": "SC"})
+    fixed_point = fixed_point_ops(polar.get("quantize"))
+    fast = polar.get("fast_enable", False)
+
+    algorithm = config_dec["algorithm"]
+    if algorithm == "SC":
+        return SCDecoder(plan, fast=fast, fixed_point=fixed_point)
+    if algorithm == "SC-List":
+        return SCLDecoder(plan, list_size=config_dec.get("list_size", 8), fast=fast, fixed_point=fixed_point)
+    if algorithm == "SC-Flip":
+        return SCFlipDecoder(plan, flip_max_iters=config_dec.get("flip_max_iters", 10), fixed_point=fixed_point)
+    raise ValueError(f"Invalid 'polar.decoder.algorithm': {algorithm}. Valid options are {list(DECODER_ALGORITHMS)}.")
@@ -0,0 +1,280 @@
+import numpy as np
+from src.coding.polar.code_plan import NODE_RATE0, NODE_REP, NODE_SPC
+from src.coding.polar.encoder import polar_transform
+
+# LLRs follow L = log(P(bit = 0) / P(bit = 1)); a negative LLR decides 1, ties decide 0.
+
+
+def f_minsum(llr_a, llr_b, out=None):
+    """
+    Check-node (upper branch) update under the min-sum approximation.
+    """
+    out = np.minimum(np.abs(llr_a), np.abs(llr_b), out=out)
+    return np.copysign(out, llr_a * llr_b, out=out)
+
+
+def f_exact(llr_a, llr_b, out=None):
+    """
+    Exact check-node update, 2 atanh(tanh(a / 2) tanh(b / 2)), in its numerically stable
+    min-sum-plus-correction form.
+    """
+    corr = np.log1p(np.exp(-np.abs(llr_a + llr_b))) - np.log1p(np.exp(-np.abs(llr_a - llr_b)))
+    out = f_minsum(llr_a, llr_b, out=out)
+    out += corr
+    return out
+
+
+def g_op(llr_a, llr_b, bits_a, out=None):
+    """
+    Variable-node (lower branch) update b + (1 - 2u) a for the decided bits u of the upper branch.
+    """
+    sign = 1.0 - 2.0 * bits_a
+    if out is None:
+        return llr_b + sign * llr_a
+    np.multiply(sign, llr_a, out=out)
+    out += llr_b
+    return out
+
+
+def hard_decision(llr):
+    return (llr < 0).astype(np.uint8)
+
+
+def decode_special_node(kind, llr):
+    """
+    Closed-form Fast-SSC decoding of a special node for a (..., size) block of LLRs.
+
+    Returns:
+        np.ndarray: The (..., size) uint8 partial sums (codeword bits) of the node.
+    """
+    if kind == NODE_RATE0:
+        return np.zeros(llr.shape, dtype=np.uint8)
+    if kind == NODE_REP:
+        bit = hard_decision(llr.sum(axis=-1, keepdims=True))
+        return np.broadcast_to(bit, llr.shape).copy()
+    bits = hard_decision(llr)
+    if kind == NODE_SPC:
+        # Wagner decoding: flip the least reliable bit when the parity check fails.
+        parity = np.bitwise_xor.reduce(bits, axis=-1)
+        weakest = np.argmin(np.abs(llr), axis=-1)
+        np.put_along_axis(
+            bits, weakest[..., None],
+            np.take_along_axis(bits, weakest[..., None], axis=-1) ^ parity[..., None], axis=-1,
+        )
+    return bits
+
+
+class SCDecoder:
+    """
+    Successive-cancellation decoder that runs every node operation over a whole batch.
+
+    LLRs live in one (batch, 2N) buffer split into stages of 2^s columns, and the partial
+    sums in a matching (batch, 2N) uint8 buffer, so each f/g update is a single NumPy
+    call across all frames. Buffers are kept between calls and only reallocated when the
+    batch grows.
+
+    When the plan carries a Fast-SSC schedule (`fast_enable` with `fast_max_size`), the
+    rate0, rate1, rep and spc nodes it lists are decoded in closed form instead of being
+    descended into. Under min-sum this gives the same decisions as plain SC for rate0,
+    rate1 and rep nodes; spc nodes are decoded ML.
+
+    Args:
+        plan (PolarCodePlan): Code to decode.
+        min_sum (bool): Use the min-sum check-node update (default) or the exact one.
+        dtype: Floating dtype of the LLR memory.
+        fast (bool): Use the plan's special-node schedule (default True).
+        fixed_point (FixedPointOps, optional): Decode on saturated integer LLRs instead;
+            channel LLRs are quantized on input and `dtype` becomes the integer type.
+            Special nodes sum their LLRs in a wide accumulator, like Fast-SSC hardware,
+            so bit-exactness with the fixed-point reference holds for fast=False.
+    """
+
+    def __init__(self, plan, min_sum=True, dtype=np.float64, fast=True, fixed_point=None):
+        self.plan = plan
+        self.f_op = f_minsum if min_sum else f_exact
+        self.g_op = g_op
+        self.dtype = dtype
+        self.fixed_point = fixed_point
+        if fixed_point is not None:
+            self.f_op, self.g_op, self.dtype = fixed_point.f_op, fixed_point.g_op, fixed_point.dtype
+        self.frozen = plan.frozen_mask.tolist()
+        self.nodes = {key: kind for key, kind in plan.node_lookup.items() if key[1] > 1} if fast else {}
+        self._batch = 0
+
+    def _alloc(self, batch):
+        if batch > self._batch:
+            len_n = self.plan.len_n
+            self._llr_buf = np.empty((batch, 2 * len_n), dtype=self.dtype)
+            self._bits_buf = np.empty((batch, 2 * len_n), dtype=np.uint8)
+            self._u_buf = np.empty((batch, len_n), dtype=np.uint8)
+            self._dec_llr_buf = np.zeros((batch, len_n), dtype=self.dtype)
+            self._batch = batch
+        # Stage s occupies columns [2^s, 2^(s + 1)); the channel LLRs sit in stage n.
+        llr = [self._llr_buf[:batch, 1 << s:2 << s] for s in range(self.plan.len_logn + 1)]
+        bits = [self._bits_buf[:batch, 1 << s:2 << s] for s in range(self.plan.len_logn + 1)]
+        return llr, bits, self._u_buf[:batch]
+
+    def decode(self, llr_chnl, flip_pos=None, resume_from=0, u_prev=None):
+        """
+        Decodes a batch of channel LLRs.
+
+        Args:
+            llr_chnl (np.ndarray): (batch, N) or (N,) channel LLRs.
+            flip_pos (np.ndarray, optional): (batch,) bit index whose hard decision is
+                inverted in each frame (SC-Flip); -1 for no flip.
+            resume_from (int): First bit to decode again. Bits before it are taken from
+                `u_prev` and the decoder state at that bit is rebuilt along the single
+                root-to-leaf path, so the work before `resume_from` is not repeated.
+            u_prev (np.ndarray, optional): (batch, N) earlier decisions, needed when
+                `resume_from` > 0.
+
+        Returns:
+            np.ndarray: (batch, N) or (N,) uint8 estimate of the u vector, frozen bits included.
+            The information and CRC bits are `u_hat[..., plan.info_set]`. The LLR each bit
+            was decided on is left in `decision_llr`.
+        """
+        llr_chnl = np.asarray(llr_chnl)
+        squeeze = llr_chnl.ndim == 1
+        if squeeze:
+            llr_chnl = llr_chnl[None, :]
+        batch = llr_chnl.shape[0]
+        llr, bits, u_hat = self._alloc(batch)
+        self.decision_llr = self._dec_llr_buf[:batch]
+        self._flip = None if flip_pos is None else np.asarray(flip_pos)
+        if self.fixed_point is not None:
+            self.fixed_point.quantize_channel(llr_chnl, out=llr[-1])
+        else:
+            llr[-1][...] = llr_chnl
+        if resume_from > 0:
+            u_hat[:, :resume_from] = u_prev[:, :resume_from]
+            self._resume_node(llr, bits, u_hat, self.plan.len_logn, 0, resume_from)
+        else:
+            self._decode_node(llr, bits, u_hat, self.plan.len_logn, 0)
+        u_hat = u_hat.copy()
+        return u_hat[0] if squeeze else u_hat
+
+    def decode_info(self, llr_chnl):
+        """
+        Returns only the (batch, len_k + len_r) decoded information and CRC bits.
+        """
+        return self.decode(llr_chnl)[..., self.plan.info_set]
+
+    def _decode_leaf(self, llr, bits, u_hat, index):
+        if self.frozen[index]:
+            bits[0][...] = 0
+        else:
+            np.less(llr[0], 0, out=bits[0], casting="unsafe")
+            if self._flip is not None:
+                bits[0][:, 0] ^= (self._flip == index).astype(np.uint8)
+            self.decision_llr[:, index] = llr[0][:, 0]
+        u_hat[:, index] = bits[0][:, 0]
+
+    def _decode_node(self, llr, bits, u_hat, stage, start):
+        if stage == 0:
+            self._decode_leaf(llr, bits, u_hat, start)
+            return
+
+        kind = self.nodes.get((start, 1 << stage))
+        if kind is not None:
+            bits[stage][...] = decode_special_node(kind, llr[stage])
+            u_hat[:, start:start + (1 << stage)] = polar_transform(bits[stage])
+            return
+
+        half = 1 << (stage - 1)
+        llr_a, llr_b = llr[stage][:, :half], llr[stage][:, half:]
+        bits_here = bits[stage]
+
+        self.f_op(llr_a, llr_b, out=llr[stage - 1])
+        self._decode_node(llr, bits, u_hat, stage - 1, start)
+        bits_here[:, :half] = bits[stage - 1]
+
+        self.g_op(llr_a, llr_b, bits_here[:, :half], out=llr[stage - 1])
+        self._decode_node(llr, bits, u_hat, stage - 1, start + half)
+        bits_here[:, :half] ^= bits[stage - 1]
+        bits_here[:, half:] = bits[stage - 1]
+
+    def _resume_node(self, llr, bits, u_hat, stage, start, resume_from):
+        # Same as _decode_node for the node containing bit `resume_from`, except that left
+        # children lying entirely before that bit are not decoded again: their partial sums
+        # are re-encoded from the earlier decisions.
+        if stage == 0:
+            self._decode_leaf(llr, bits, u_hat, start)
+            return
+
+        half = 1 << (stage - 1)
+        llr_a, llr_b = llr[stage][:, :half], llr[stage][:, half:]
+        bits_here = bits[stage]
+
+        if resume_from < start + half:
+            self.f_op(llr_a, llr_b, out=llr[stage - 1])
+            self._resume_node(llr, bits, u_hat, stage - 1, start, resume_from)
+            bits_here[:, :half] = bits[stage - 1]
+            self.g_op(llr_a, llr_b, bits_here[:, :half], out=llr[stage - 1])
+            self._decode_node(llr, bits, u_hat, stage - 1, start + half)
+        else:
+            polar_transform(u_hat[:, start:start + half], out=bits_here[:, :half])
+            self.g_op(llr_a, llr_b, bits_here[:, :half], out=llr[stage - 1])
+            self._resume_node(llr, bits, u_hat, stage - 1, start + half, resume_from)
+        bits_here[:, :half] ^= bits[stage - 1]
+        bits_here[:, half:] = bits[stage - 1]
+
+
+def _fixed_point_reference_ops(fixed_point):
+    # Scalar, pure-integer restatement of the fixed-point rules from the bit widths alone,
+    # independent of the vectorized FixedPointOps helpers it is used to check:
+    # round half to even onto the 1 / 2^bits_frac grid, saturate to the narrower of the
+    # channel and internal ranges; f = sign(a) sign(b) min(|a|, |b|) and
+    # g = b + (1 - 2u) a, both saturated to the internal range.
+    step = 1 << fixed_point.bits_frac
+    intl_lo, intl_hi = -(1 << (fixed_point.bits_intl - 1)), (1 << (fixed_point.bits_intl - 1)) - 1
+    chnl_lo, chnl_hi = -(1 << (fixed_point.bits_chnl - 1)), (1 << (fixed_point.bits_chnl - 1)) - 1
+
+    def saturate(v, lo, hi):
+        return lo if v < lo else hi if v > hi else v
+
+    def quantize(llr):
+        return [saturate(round(float(v) * step), max(chnl_lo, intl_lo), min(chnl_hi, intl_hi)) for v in llr]
+
+    def f(llr_a, llr_b):
+        out = []
+        for a, b in zip(llr_a, llr_b):
+            m = min(abs(a), abs(b))
+            out.append(saturate(-m if (a < 0) != (b < 0) else m, intl_lo, intl_hi))
+        return out
+
+    def g(llr_a, llr_b, bits_a):
+        return [saturate(b - a if u else b + a, intl_lo, intl_hi) for a, b, u in zip(llr_a, llr_b, bits_a)]
+
+    return quantize, f, g
+
+
+def sc_decode_reference(llr_chnl, frozen_mask, min_sum=True, fixed_point=None):
+    """
+    Scalar single-frame SC decoder, the reference the batched decoders are checked against.
+    With `fixed_point`, the channel LLRs are quantized and every update is done in plain
+    Python integers following the saturation and rounding rules of its bit widths, not
+    with the FixedPointOps helpers the decoders use.
+
+    Returns:
+        tuple: (u_hat, x_hat) as uint8 arrays of length N.
+    """
+    f_op = f_minsum if min_sum else f_exact
+    g = g_op
+    llr_chnl = np.asarray(llr_chnl, dtype=np.float64)
+    if fixed_point is not None:
+        quantize, f_op, g = _fixed_point_reference_ops(fixed_point)
+        llr_chnl = quantize(llr_chnl)
+    u_hat = np.zeros(len(frozen_mask), dtype=np.uint8)
+
+    def decode(llr, start):
+        if len(llr) == 1:
+            u = 0 if frozen_mask[start] else int(llr[0] < 0)
+            u_hat[start] = u
+            return np.array([u], dtype=np.uint8)
+        half = len(llr) // 2
+        x_a = decode(f_op(llr[:half], llr[half:]), start)
+        x_b = decode(g(llr[:half], llr[half:], x_a), start + half)
+        return np.concatenate((x_a ^ x_b, x_b))
+
+    x_hat = decode(llr_chnl, 0)
+    return u_hat, x_hat
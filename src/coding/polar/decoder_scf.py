@@ -0,0 +1,92 @@
+import numpy as np
+from src.coding.crc.crc import crc_check_batch
+from src.coding.polar.decoder_sc import SCDecoder
+
+
+class SCFlipDecoder:
+    """
+    CRC-aided SC-Flip decoder working on compacted sub-batches.
+
+    A first SC pass decodes the whole batch. Every frame whose CRC fails gets an ordered
+    list of flip candidates: the bits of the plan's precomputed critical set sorted by
+    the magnitude of the LLR they were decided on. Attempt t gathers the frames that are
+    still failing into one compacted sub-batch and decodes it again with the t-th
+    candidate of each frame flipped. The decoder resumes from the earliest flip position
+    of the sub-batch, rebuilding its state from the first-pass decisions instead of
+    restarting at bit 0. Frames that never pass keep their first-pass decisions.
+
+    Args:
+        plan (PolarCodePlan): Code to decode; it must carry a CRC.
+        flip_max_iters (int): Maximum number of flip attempts per frame.
+        min_sum (bool): Min-sum (default) or exact check-node updates.
+        crc_preload (int): 0 or 1, see `crc_encode`.
+        fixed_point (FixedPointOps, optional): Decode on saturated integer LLRs.
+    """
+
+    def __init__(self, plan, flip_max_iters=10, min_sum=True, crc_preload=0, dtype=np.float64, fixed_point=None):
+        if plan.len_r == 0:
+            raise ValueError("SC-Flip decoding needs a CRC: enable 'polar.crc'.")
+        if flip_max_iters < 0:
+            raise ValueError(f"'polar.decoder.flip_max_iters' ({flip_max_iters}) must be a non-negative value.")
+        self.plan = plan
+        self.flip_max_iters = flip_max_iters
+        self.crc_preload = crc_preload
+        # Flips are applied to bit-level decisions, so special nodes are not collapsed.
+        self.sc = SCDecoder(plan, min_sum=min_sum, dtype=dtype, fast=False, fixed_point=fixed_point)
+        self.last_attempts = None
+        self.last_crc_pass = None
+
+    def _check(self, u_hat):
+        plan = self.plan
+        return crc_check_batch(u_hat[:, plan.info_set], plan.len_k, plan.len_r, self.crc_preload)
+
+    def decode(self, llr_chnl):
+        """
+        Returns the (batch, N) uint8 u estimate, like `SCDecoder.decode`.
+
+        After the call, `last_attempts` holds the number of flip attempts each frame used
+        and `last_crc_pass` whether its final decision passes the CRC.
+        """
+        llr_chnl = np.asarray(llr_chnl)
+        squeeze = llr_chnl.ndim == 1
+        if squeeze:
+            llr_chnl = llr_chnl[None, :]
+        batch = llr_chnl.shape[0]
+
+        u_first = self.sc.decode(llr_chnl)
+        passing = self._check(u_first)
+        attempts = np.zeros(batch, dtype=np.int64)
+        u_hat = u_first
+
+        failing = np.flatnonzero(~passing)
+        critical = self.plan.critical_set
+        n_flips = min(self.flip_max_iters, len(critical))
+        if len(failing) and n_flips:
+            reliability = np.abs(self.sc.decision_llr[failing][:, critical])
+            candidates = critical[np.argsort(reliability, axis=1, kind="stable")[:, :n_flips]]
+            u_base = u_first[failing]
+            active = np.arange(len(failing))
+
+            for t in range(n_flips):
+                flip_pos = candidates[active, t]
+                frames = failing[active]
+                u_try = self.sc.decode(
+                    llr_chnl[frames], flip_pos=flip_pos, resume_from=int(flip_pos.min()), u_prev=u_base[active]
+                )
+                attempts[frames] += 1
+                ok = self._check(u_try)
+                u_hat[frames[ok]] = u_try[ok]
+                passing[frames[ok]] = True
+                active = active[~ok]
+                if len(active) == 0:
+                    break
+
+        self.last_attempts = attempts
+        self.last_crc_pass = passing
+        return u_hat[0] if squeeze else u_hat
+
+    def decode_info(self, llr_chnl):
+        """
+        Returns only the (batch, len_k + len_r) decoded information and CRC bits.
+        """
+        return self.decode(llr_chnl)[..., self.plan.info_set]
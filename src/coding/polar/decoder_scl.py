@@ -0,0 +1,274 @@
+import numpy as np
+from src.coding.crc.crc import crc_check_batch
+from src.coding.polar.code_plan import NODE_RATE0, NODE_REP, NODE_SPC
+from src.coding.polar.decoder_sc import f_minsum, f_exact, g_op
+from src.coding.polar.encoder import polar_transform
+
+MAX_LIST_SIZE = 32
+
+
+def _gather(arr, ptr):
+    # arr: (batch, L, m), ptr: (batch, L) -> arr[b, ptr[b, l], :]
+    return np.take_along_axis(arr, ptr[:, :, None], axis=1)
+
+
+class SCLDecoder:
+    """
+    Batched SC-List decoder with pointer-shared path memory.
+
+    Every stage s has one (batch, L, 2^s) LLR array and one partial-sum array, so the
+    memory grows with L * N. Paths do not own arrays: each path holds a pointer per stage
+    into the L slots of that stage. A split or a pruning step only rewrites the (batch, L)
+    pointer tables, and several paths may reference the same slot; the data are gathered
+    through the pointers when a stage is next read. Because all paths write a stage
+    together, a write never has to preserve a shared slot, so the copy-on-write reference
+    counts collapse into the pointer tables themselves.
+
+    At each information bit the (batch, 2L) candidate metrics are pruned with
+    `argpartition`; decisions are kept as per-bit (bit, parent) traces and the surviving
+    paths are reconstructed by a traceback at the end. With a CRC in the plan, the final
+    path is the best-metric candidate that passes `crc_check_batch`.
+
+    With a Fast-SSC schedule in the plan, special nodes are list-decoded in closed form
+    (Fast-SSCL): rate0 nodes only update the metrics, rep nodes split once into the
+    all-zero and all-one words, and rate1/spc nodes split over their least reliable
+    bits, min(L - 1, size) and min(L, size) - 1 times. The metrics are those of the
+    min-sum path metric.
+
+    Args:
+        plan (PolarCodePlan): Code to decode.
+        list_size (int): Number of paths L, 1..32.
+        min_sum (bool): Min-sum updates and the |LLR| path-metric approximation (default),
+            or exact updates with the exact log(1 + e^-x) metric.
+        crc_preload (int): 0 or 1, see `crc_encode`.
+        fast (bool): Use the plan's special-node schedule (default True).
+        fixed_point (FixedPointOps, optional): Keep the path LLRs as saturated integers;
+            path metrics are then in units of the quantization step.
+    """
+
+    def __init__(self, plan, list_size=8, min_sum=True, crc_preload=0, dtype=np.float64, fast=True,
+                 fixed_point=None):
+        if not 1 <= list_size <= MAX_LIST_SIZE:
+            raise ValueError(f"'polar.decoder.list_size' ({list_size}) must be between 1 and {MAX_LIST_SIZE}.")
+        self.plan = plan
+        self.list_size = list_size
+        self.min_sum = min_sum
+        self.f_op = f_minsum if min_sum else f_exact
+        self.g_op = g_op
+        self.crc_preload = crc_preload
+        self.dtype = dtype
+        self.fixed_point = fixed_point
+        if fixed_point is not None:
+            self.f_op, self.g_op, self.dtype = fixed_point.f_op, fixed_point.g_op, fixed_point.dtype
+        self.frozen = plan.frozen_mask.tolist()
+        self.nodes = {key: kind for key, kind in plan.node_lookup.items() if key[1] > 1} if fast else {}
+        self.last_crc_pass = None
+
+    def _init_state(self, llr_chnl):
+        batch = llr_chnl.shape[0]
+        n, L = self.plan.len_logn, self.list_size
+        self.batch = batch
+        self.llr = [np.empty((batch, L, 1 << s), dtype=self.dtype) for s in range(n + 1)]
+        self.bits = [np.empty((batch, L, 1 << s), dtype=np.uint8) for s in range(n + 1)]
+        self.identity = np.broadcast_to(np.arange(L), (batch, L))
+        self.ptr_llr = [self.identity] * (n + 1)
+        self.ptr_bits = [self.identity] * (n + 1)
+        # All paths start from the same channel LLRs; only path 0 is alive.
+        if self.fixed_point is not None:
+            llr_chnl = self.fixed_point.quantize_channel(llr_chnl)
+        self.llr[n][...] = llr_chnl[:, None, :]
+        self.pm = np.full((batch, L), np.inf)
+        self.pm[:, 0] = 0.0
+        self.bit_trace = np.empty((self.plan.len_info, batch, L), dtype=np.uint8)
+        self.parent_trace = np.empty((self.plan.len_info, batch, L), dtype=np.int16)
+        self.info_count = 0
+
+    def _penalty(self, llr, bit):
+        # Cost of deciding `bit` against `llr`: |llr| if they disagree (min-sum) or
+        # log(1 + exp(-(1 - 2 bit) llr)) (exact).
+        if self.min_sum:
+            return np.where((llr < 0) != bit, np.abs(llr), 0.0)
+        return np.logaddexp(0.0, -(1.0 - 2.0 * bit) * llr)
+
+    def _permute(self, parent):
+        for s in range(len(self.ptr_llr)):
+            self.ptr_llr[s] = np.take_along_axis(self.ptr_llr[s], parent, axis=1)
+            self.ptr_bits[s] = np.take_along_axis(self.ptr_bits[s], parent, axis=1)
+
+    def _prune(self, cand):
+        # Keeps the L best of the (batch, M * L) candidates; candidate c extends path c % L
+        # with choice c // L.
+        L = self.list_size
+        keep = np.argpartition(cand, L - 1, axis=1)[:, :L]
+        self.pm = np.take_along_axis(cand, keep, axis=1)
+        return keep % L, keep // L
+
+    def _record(self, u_info, parent):
+        # u_info: (batch, L, m) decided information bits, parent: (batch, L) path each
+        # survivor extends. Only the first bit needs the parent for the traceback.
+        m = u_info.shape[-1]
+        j = self.info_count
+        self.bit_trace[j:j + m] = np.moveaxis(u_info, -1, 0)
+        self.parent_trace[j] = parent
+        self.parent_trace[j + 1:j + m] = self.identity
+        self.info_count += m
+
+    def _decode_leaf(self, index):
+        llr = self.llr[0][:, :, 0]
+        if self.frozen[index]:
+            self.pm = self.pm + self._penalty(llr, 0)
+            self.bits[0][...] = 0
+            self.ptr_bits[0] = self.identity
+            return
+
+        cand = np.concatenate((self.pm + self._penalty(llr, 0), self.pm + self._penalty(llr, 1)), axis=1)
+        parent, decided = self._prune(cand)
+        decided = decided.astype(np.uint8)
+        self._permute(parent)
+
+        self.bits[0][:, :, 0] = decided
+        self.ptr_bits[0] = self.identity
+        self._record(decided[:, :, None], parent)
+
+    def _decode_special(self, kind, stage, start):
+        size = 1 << stage
+        alpha = _gather(self.llr[stage], self.ptr_llr[stage])
+        hard = (alpha < 0).astype(np.uint8)
+        mag = np.abs(alpha)
+        info_local = ~self.plan.frozen_mask[start:start + size]
+
+        if kind == NODE_RATE0:
+            self.pm = self.pm + (mag * hard).sum(axis=-1)
+            self.bits[stage][...] = 0
+            self.ptr_bits[stage] = self.identity
+            return
+
+        if kind == NODE_REP:
+            cost_one = (mag * (1 - hard)).sum(axis=-1)
+            cost_zero = (mag * hard).sum(axis=-1)
+            parent, choice = self._prune(np.concatenate((self.pm + cost_zero, self.pm + cost_one), axis=1))
+            x = np.broadcast_to(choice.astype(np.uint8)[:, :, None], alpha.shape)
+        else:
+            x = hard.copy()
+            order = np.argsort(mag, axis=-1)
+            first, steps = 0, min(self.list_size - 1, size)
+            if kind == NODE_SPC:
+                # Satisfy the parity first by flipping the least reliable bit, then split over
+                # the next bits, each flipped together with that one to keep the parity.
+                weakest = order[..., :1]
+                parity = np.bitwise_xor.reduce(x, axis=-1)
+                self.pm = self.pm + parity * np.take_along_axis(mag, weakest, axis=-1)[..., 0]
+                np.put_along_axis(x, weakest, np.take_along_axis(x, weakest, axis=-1) ^ parity[..., None], axis=-1)
+                first, steps = 1, min(self.list_size, size) - 1
+
+            parent = self.identity
+            for t in range(first, first + steps):
+                pos = order[..., t:t + 1]
+                delta = self._flip_cost(x, hard, mag, pos)
+                if kind == NODE_SPC:
+                    delta = delta + self._flip_cost(x, hard, mag, weakest)
+                step_parent, flip = self._prune(np.concatenate((self.pm, self.pm + delta), axis=1))
+                parent = np.take_along_axis(parent, step_parent, axis=1)
+                x, hard, mag, order = (_gather(a, step_parent) for a in (x, hard, mag, order))
+                flip = flip.astype(np.uint8)[:, :, None]
+                pos = order[..., t:t + 1]
+                np.put_along_axis(x, pos, np.take_along_axis(x, pos, axis=-1) ^ flip, axis=-1)
+                if kind == NODE_SPC:
+                    weakest = order[..., :1]
+                    np.put_along_axis(x, weakest, np.take_along_axis(x, weakest, axis=-1) ^ flip, axis=-1)
+
+        self._permute(parent)
+        self.bits[stage][...] = x
+        self.ptr_bits[stage] = self.identity
+        self._record(polar_transform(x)[..., info_local], parent)
+
+    @staticmethod
+    def _flip_cost(x, hard, mag, pos):
+        # Metric change of flipping x at `pos`: +|llr| when x agrees with the hard decision.
+        agree = np.take_along_axis(x, pos, axis=-1) == np.take_along_axis(hard, pos, axis=-1)
+        return np.where(agree, 1.0, -1.0)[..., 0] * np.take_along_axis(mag, pos, axis=-1)[..., 0]
+
+    def _decode_node(self, stage, start):
+        if stage == 0:
+            self._decode_leaf(start)
+            return
+
+        kind = self.nodes.get((start, 1 << stage))
+        if kind is not None:
+            self._decode_special(kind, stage, start)
+            return
+
+        half = 1 << (stage - 1)
+        parent = _gather(self.llr[stage], self.ptr_llr[stage])
+        self.f_op(parent[..., :half], parent[..., half:], out=self.llr[stage - 1])
+        self.ptr_llr[stage - 1] = self.identity
+        self._decode_node(stage - 1, start)
+
+        self.bits[stage][..., :half] = _gather(self.bits[stage - 1], self.ptr_bits[stage - 1])
+        self.ptr_bits[stage] = self.identity
+
+        # The path set may have changed while decoding the left child: gather again.
+        parent = _gather(self.llr[stage], self.ptr_llr[stage])
+        self.g_op(parent[..., :half], parent[..., half:], self.bits[stage][..., :half], out=self.llr[stage - 1])
+        self.ptr_llr[stage - 1] = self.identity
+        self._decode_node(stage - 1, start + half)
+
+        left = _gather(self.bits[stage][..., :half], self.ptr_bits[stage])
+        right = _gather(self.bits[stage - 1], self.ptr_bits[stage - 1])
+        np.bitwise_xor(left, right, out=self.bits[stage][..., :half])
+        self.bits[stage][..., half:] = right
+        self.ptr_bits[stage] = self.identity
+
+    def _traceback(self):
+        # Reconstructs the (batch, L, len_info) information and CRC bits of every path.
+        cands = np.empty((self.batch, self.list_size, self.plan.len_info), dtype=np.uint8)
+        cur = self.identity
+        for j in range(self.plan.len_info - 1, -1, -1):
+            cands[:, :, j] = np.take_along_axis(self.bit_trace[j], cur, axis=1)
+            cur = np.take_along_axis(self.parent_trace[j], cur, axis=1)
+        return cands
+
+    def decode_candidates(self, llr_chnl):
+        """
+        Runs the list decoder and returns (candidates, path metrics): the (batch, L, len_info)
+        information and CRC bits of every surviving path and their (batch, L) metrics.
+        """
+        llr_chnl = np.asarray(llr_chnl)
+        self._init_state(llr_chnl)
+        self._decode_node(self.plan.len_logn, 0)
+        return self._traceback(), self.pm
+
+    def select(self, cands, pm):
+        """
+        Picks one candidate per frame: the best metric among CRC-passing paths, or the best
+        metric overall when no path passes (or the code has no CRC). Sets `last_crc_pass`.
+        """
+        plan = self.plan
+        if plan.len_r > 0:
+            passing = crc_check_batch(cands, plan.len_k, plan.len_r, self.crc_preload)
+            self.last_crc_pass = passing.any(axis=1)
+            pm = np.where(passing | ~self.last_crc_pass[:, None], pm, np.inf)
+        else:
+            self.last_crc_pass = None
+        best = np.argmin(pm, axis=1)
+        return cands[np.arange(len(best)), best]
+
+    def decode_info(self, llr_chnl):
+        """
+        Returns the (batch, len_k + len_r) decoded information and CRC bits.
+        """
+        llr_chnl = np.asarray(llr_chnl)
+        squeeze = llr_chnl.ndim == 1
+        if squeeze:
+            llr_chnl = llr_chnl[None, :]
+        info = self.select(*self.decode_candidates(llr_chnl))
+        return info[0] if squeeze else info
+
+    def decode(self, llr_chnl):
+        """
+        Returns the (batch, N) uint8 u estimate, like `SCDecoder.decode`.
+        """
+        info = self.decode_info(llr_chnl)
+        u_hat = np.zeros(info.shape[:-1] + (self.plan.len_n,), dtype=np.uint8)
+        u_hat[..., self.plan.info_set] = info
+        return u_hat
@@ -0,0 +1,88 @@
+import numpy as np
+from src.coding.crc.crc import crc_attach_batch
+
+
+def polar_transform(vec_u, out=None):
+    """
+    Applies x = u F^{(x)n}, F = [[1, 0], [1, 1]], to every row of a (batch, N) bit array.
+
+    Each of the log2(N) butterfly stages is one XOR over the whole batch: the array is
+    viewed as (batch, N / 2h, 2, h) blocks and the upper half of every block is XORed
+    with its lower half. Works in place when `out` is `vec_u`.
+
+    Args:
+        vec_u (np.ndarray): uint8 bits of shape (batch, N) or (N,).
+        out (np.ndarray, optional): Output buffer of the same shape.
+
+    Returns:
+        np.ndarray: The transformed bits.
+    """
+    if out is None:
+        out = np.array(vec_u, dtype=np.uint8, copy=True)
+    elif out is not vec_u:
+        out[...] = vec_u
+    len_n = out.shape[-1]
+    lead = out.shape[:-1]
+    half = 1
+    while half < len_n:
+        blocks = out.reshape(lead + (len_n // (2 * half), 2, half))
+        blocks[..., 0, :] ^= blocks[..., 1, :]
+        half *= 2
+    return out
+
+
+def polar_encode_batch(vec_info, plan, systematic=False, crc_preload=0, out=None):
+    """
+    Encodes a batch of information words with a PolarCodePlan.
+
+    Args:
+        vec_info (np.ndarray): (batch, len_k) information bits, in which case the plan's CRC
+            is attached with the batched CRC path, or (batch, len_k + len_r) bits that
+            already carry their CRC.
+        plan (PolarCodePlan): Code to encode with.
+        systematic (bool): If True, the information bits appear unchanged at the
+            information-set positions of the codeword (two-pass encoding with the frozen
+            bits cleared in between, valid for domination-contiguous information sets
+            such as the 3GPP and GA constructions).
+        crc_preload (int): 0 or 1, see `crc_encode`.
+        out (np.ndarray, optional): (batch, N) uint8 buffer for the codewords.
+
+    Returns:
+        np.ndarray: (batch, N) uint8 codewords.
+    """
+    vec_info = np.asarray(vec_info)
+    squeeze = vec_info.ndim == 1
+    if squeeze:
+        vec_info = vec_info[None, :]
+    batch, width = vec_info.shape
+
+    if width == plan.len_k and plan.len_r > 0:
+        vec_info = crc_attach_batch(vec_info, plan.len_r, crc_preload)
+    elif width != plan.len_info:
+        raise ValueError(
+            f"Expected {plan.len_k} or {plan.len_info} bits per frame for this code, got {width}."
+        )
+
+    if out is None:
+        out = np.zeros((batch, plan.len_n), dtype=np.uint8)
+    else:
+        out[...] = 0
+    out[:, plan.info_set] = vec_info
+    polar_transform(out, out)
+
+    if systematic:
+        out[:, plan.frozen_mask] = 0
+        polar_transform(out, out)
+
+    return out[0] if squeeze else out
+
+
+def polar_extract_info(vec_x, plan, systematic=False):
+    """
+    Returns the (batch, len_k + len_r) information and CRC bits carried by (batch, N) codewords.
+    The transform is its own inverse, so non-systematic codewords are transformed back first.
+    """
+    vec_x = np.asarray(vec_x)
+    if systematic:
+        return vec_x[..., plan.info_set]
+    return polar_transform(vec_x)[..., plan.info_set]
@@ -0,0 +1,84 @@
+import numpy as np
+
+
+def storage_dtype(bits):
+    """
+    Smallest signed integer type that holds a `bits`-bit value and the sum of two of them,
+    so that saturating additions never wrap before they are clipped.
+    """
+    if bits <= 7:
+        return np.int8
+    if bits <= 15:
+        return np.int16
+    return np.int32
+
+
+class FixedPointOps:
+    """
+    Saturating fixed-point LLR arithmetic described by a validated `polar.quantize` section.
+
+    LLRs are integers in units of 1 / step (step = 2^bits_frac). Channel LLRs saturate to
+    `bits_chnl` bits and internal LLRs to `bits_intl` bits; both live in the
+    `storage_dtype` of the internal width, e.g. int8 for the default 5/6/1 configuration.
+    The check node is min-sum on magnitudes and the variable node a saturating add, so
+    all decoding runs on small integer arrays.
+    """
+
+    def __init__(self, config_quant):
+        self.bits_chnl = config_quant["bits_chnl"]
+        self.bits_intl = config_quant["bits_intl"]
+        self.bits_frac = config_quant["bits_frac"]
+        self.step = 2 ** config_quant["bits_frac"]
+        self.chnl_max = 2 ** (config_quant["bits_chnl"] - 1) - 1
+        self.chnl_min = -(2 ** (config_quant["bits_chnl"] - 1))
+        self.intl_max = 2 ** (config_quant["bits_intl"] - 1) - 1
+        self.intl_min = -(2 ** (config_quant["bits_intl"] - 1))
+        self.dtype = storage_dtype(config_quant["bits_intl"])
+        self.sign_shift = np.dtype(self.dtype).itemsize * 8 - 1
+
+    def quantize_channel(self, llr, out=None):
+        """
+        Rounds channel LLRs to the fixed-point grid and saturates them.
+        """
+        scaled = np.rint(np.asarray(llr) * self.step)
+        lo = max(self.chnl_min, self.intl_min)
+        hi = min(self.chnl_max, self.intl_max)
+        np.clip(scaled, lo, hi, out=scaled)
+        if out is None:
+            return scaled.astype(self.dtype)
+        out[...] = scaled
+        return out
+
+    def to_float(self, llr_q):
+        return np.asarray(llr_q, dtype=np.float64) / self.step
+
+    def f_op(self, llr_a, llr_b, out=None):
+        # min(|a|, |b|) negated where the signs differ; for two's complement integers the
+        # sign of a * b is the sign of a ^ b, and (m ^ s) - s negates m where s == -1.
+        # The magnitude saturates too: |intl_min| itself is out of range.
+        sign = np.bitwise_xor(llr_a, llr_b)
+        np.right_shift(sign, self.sign_shift, out=sign)
+        out = np.minimum(np.abs(llr_a), np.abs(llr_b), out=out)
+        np.minimum(out, self.intl_max, out=out)
+        np.bitwise_xor(out, sign, out=out)
+        np.subtract(out, sign, out=out)
+        return out
+
+    def g_op(self, llr_a, llr_b, bits_a, out=None):
+        # b + (1 - 2u) a, saturated to the internal range.
+        sign = np.negative(bits_a, dtype=self.dtype)
+        out = np.bitwise_xor(llr_a, sign, out=out)
+        np.subtract(out, sign, out=out)
+        np.add(out, llr_b, out=out)
+        np.minimum(out, self.intl_max, out=out)
+        np.maximum(out, self.intl_min, out=out)
+        return out
+
+
+def fixed_point_ops(config_quant):
+    """
+    Returns the FixedPointOps of a validated quantize section, or None when it is disabled.
+    """
+    if not config_quant or not config_quant.get("enable", False):
+        return None
+    return FixedPointOps(config_quant)
@@ -0,0 +1,209 @@
+import os
+import re
+import json
+import numpy as np
+from functools import lru_cache
+
+POLAR_LIB_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "lib", "ecc", "polar"))
+STORE_FILE = os.path.join(POLAR_LIB_DIR, "reliability_store.npy")
+INDEX_FILE = os.path.join(POLAR_LIB_DIR, "reliability_store.json")
+
+MASTER_NAME = "3gpp"
+MASTER_SOURCE = os.path.join("3gpp", "n1024_3gpp.pc")
+MASTER_LEN = 1024
+
+# Files named like the 3GPP library (n64_3gpp.pc, n32_3gpp.pc, ...) are derived from the master sequence.
+_3GPP_FILE_PATTERN = re.compile(r"^n(\d+)_3gpp\.pc$")
+# Gaussian-approximation files (see construction.py) that are neither in the store nor
+# on disk are constructed in memory on first use; only `write_polar_code` adds them to
+# the library.
+_GA_FILE_PATTERN = re.compile(r"^n(\d+)_awgn_ga(-?\d+(?:\.\d+)?)dB\.pc$")
+
+# Reliability sequences in the store and in .pc files are ordered from the most
+# to the least reliable bit index, so the first entry is always len_n - 1.
+
+
+def parse_polarcode_file(filepath):
+    """
+    Parses a whitespace-separated `.pc` reliability file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not a permutation of 0..N-1 with N a power of 2.
+    """
+    with open(filepath, "r") as file:
+        rel_idx = np.array(file.read().split(), dtype=np.int64)
+    check_reliability_sequence(rel_idx, filepath)
+    return rel_idx
+
+
+def check_reliability_sequence(rel_idx, source):
+    len_n = len(rel_idx)
+    if len_n == 0 or len_n & (len_n - 1):
+        raise ValueError(f"Reliability sequence '{source}' has length {len_n}, which is not a power of 2.")
+    if not np.array_equal(np.sort(rel_idx), np.arange(len_n)):
+        raise ValueError(f"Reliability sequence '{source}' is not a permutation of 0..{len_n - 1}.")
+
+
+def build_reliability_store(sources=None):
+    """
+    Rebuilds the binary store from `.pc` files of the polar library.
+
+    The store is one uint16 `.npy` array holding every sequence back to back, and a
+    JSON index mapping a sequence name to its offset and length. The 3GPP master
+    sequence comes first; every other `.pc` file directly under the library directory
+    (e.g. the AWGN-designed `n16_awgn_s0.6.pc`) is indexed by its file stem.
+
+    Args:
+        sources (dict, optional): name -> `.pc` path relative to the library directory.
+
+    Returns:
+        dict: The written index.
+    """
+    if sources is None:
+        sources = {MASTER_NAME: MASTER_SOURCE}
+        for filename in sorted(os.listdir(POLAR_LIB_DIR)):
+            if filename.endswith(".pc"):
+                sources[os.path.splitext(filename)[0]] = filename
+
+    index = {}
+    chunks = []
+    offset = 0
+    for name, source in sources.items():
+        rel_idx = parse_polarcode_file(os.path.join(POLAR_LIB_DIR, source))
+        index[name] = {"offset": offset, "len_n": len(rel_idx), "source": source.replace(os.sep, "/")}
+        chunks.append(rel_idx.astype(np.uint16))
+        offset += len(rel_idx)
+
+    write_reliability_store(np.concatenate(chunks), index)
+    return index
+
+
+def register_reliability_sequence(name, rel_idx, source):
+    """
+    Adds (or replaces) a named sequence in the binary store.
+    """
+    check_reliability_sequence(np.asarray(rel_idx), name)
+    data, index = load_reliability_store()
+    chunks = []
+    new_index = {}
+    offset = 0
+    for entry_name, entry in index.items():
+        if entry_name == name:
+            continue
+        chunks.append(np.array(data[entry["offset"]:entry["offset"] + entry["len_n"]]))
+        new_index[entry_name] = dict(entry, offset=offset)
+        offset += entry["len_n"]
+    chunks.append(np.asarray(rel_idx, dtype=np.uint16))
+    new_index[name] = {"offset": offset, "len_n": len(rel_idx), "source": source}
+    data = np.concatenate(chunks)
+    load_reliability_store.cache_clear()  # release the memory map before overwriting the file
+    write_reliability_store(data, new_index)
+
+
+def write_reliability_store(data, index):
+    np.save(STORE_FILE, np.asarray(data, dtype=np.uint16))
+    with open(INDEX_FILE, "w") as f:
+        json.dump(index, f, indent=4)
+        f.write("\n")
+    load_reliability_store.cache_clear()
+    get_reliability_sequence.cache_clear()
+    import_reliability_sequence.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def load_reliability_store():
+    """
+    Returns (data, index) where `data` is a read-only memory map of the store.
+    """
+    if not (os.path.exists(STORE_FILE) and os.path.exists(INDEX_FILE)):
+        raise FileNotFoundError(
+            f"Reliability store not found at '{STORE_FILE}'. Run `python -m src.coding.polar.reliability` to build it."
+        )
+    with open(INDEX_FILE, "r") as f:
+        index = json.load(f)
+    return np.load(STORE_FILE, mmap_mode="r"), index
+
+
+@lru_cache(maxsize=64)
+def get_reliability_sequence(len_n, name=MASTER_NAME):
+    """
+    Returns the reliability sequence of a length-len_n code, most reliable index first.
+
+    For the 3GPP sequence, every len_n <= 1024 is derived from the 38.212 master
+    sequence by keeping its entries below len_n, in one O(MASTER_LEN) pass. Other
+    names are read straight from the store. The returned array is read-only and
+    shared between callers.
+
+    Raises:
+        ValueError: If the length is not available for the requested sequence.
+    """
+    data, index = load_reliability_store()
+    if name not in index:
+        raise ValueError(f"Unknown reliability sequence '{name}'. Available: {sorted(index)}.")
+    entry = index[name]
+    seq = data[entry["offset"]:entry["offset"] + entry["len_n"]]
+
+    if name == MASTER_NAME:
+        if len_n <= 0 or len_n & (len_n - 1) or len_n > entry["len_n"]:
+            raise ValueError(
+                f"3GPP polar codes need a power-of-2 length up to {entry['len_n']}, got {len_n}."
+            )
+        rel_idx = seq[seq < len_n].astype(np.int64)
+    else:
+        if len_n != entry["len_n"]:
+            raise ValueError(f"Reliability sequence '{name}' has length {entry['len_n']}, not {len_n}.")
+        rel_idx = seq.astype(np.int64)
+
+    rel_idx.setflags(write=False)
+    return rel_idx
+
+
+def resolve_polar_file(filepath):
+    """
+    Maps a `polar_file` path to its (name, len_n) entry in the store, or None if the
+    file is not covered by the store.
+    """
+    filename = os.path.basename(filepath)
+    match = _3GPP_FILE_PATTERN.match(filename)
+    if match:
+        return MASTER_NAME, int(match.group(1))
+    try:
+        _, index = load_reliability_store()
+    except FileNotFoundError:
+        return None
+    name = os.path.splitext(filename)[0]
+    match = _GA_FILE_PATTERN.match(filename)
+    if match:
+        # Registered under the normalized name, e.g. n64_awgn_ga2.5dB for n64_awgn_ga2.50dB.
+        from src.coding.polar.construction import ga_file_name
+        name = os.path.splitext(ga_file_name(int(match.group(1)), float(match.group(2))))[0]
+    if name in index and name != MASTER_NAME:
+        return name, index[name]["len_n"]
+    return None
+
+
+@lru_cache(maxsize=64)
+def import_reliability_sequence(filepath):
+    """
+    Loads the reliability sequence named by a `polar_file` path.
+
+    Sequences covered by the store are a cache hit; Gaussian-approximation files that
+    do not exist are constructed without writing anything; any other `.pc` file is
+    parsed once and cached.
+    """
+    resolved = resolve_polar_file(filepath)
+    if resolved is not None:
+        return get_reliability_sequence(resolved[1], resolved[0])
+    match = _GA_FILE_PATTERN.match(os.path.basename(filepath))
+    if match and not os.path.exists(filepath):
+        from src.coding.polar.construction import construct_polar_code
+        return construct_polar_code(int(match.group(1)), float(match.group(2)))
+    rel_idx = parse_polarcode_file(filepath)
+    rel_idx.setflags(write=False)
+    return rel_idx
+
+
+if __name__ == "__main__":
+    for seq_name, seq_entry in build_reliability_store().items():
+        print(f"{seq_name}: {seq_entry['len_n']} entries from {seq_entry['source']}")
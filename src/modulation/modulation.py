@@ -0,0 +1,159 @@
+import numpy as np
+from functools import lru_cache
+
+# Bits per symbol of every supported modulation.
+MOD_BITS = {
+    "BPSK": 1,
+    "QPSK": 2,
+    "16QAM": 4,
+}
+
+DEMOD_TYPES = ("soft", "hard")
+LLR_METHODS = ("maxlog", "exact")
+
+# LLR magnitude handed to the decoder by the hard demapper.
+HARD_LLR = 1.0
+
+_QAM16_SCALE = 1 / np.sqrt(10)
+
+
+@lru_cache(maxsize=None)
+def get_constellation(mod_type):
+    """
+    Returns the unit-energy constellation of a modulation as a read-only complex LUT,
+    indexed by the symbol's bits read MSB first.
+
+    BPSK maps 0 -> +1. QPSK and 16QAM use the Gray mappings of 38.211 5.1:
+    QPSK (b0, b1) -> ((1 - 2 b0) + j (1 - 2 b1)) / sqrt(2),
+    16QAM (b0..b3) -> ((1 - 2 b0)(2 - (1 - 2 b2)) + j (1 - 2 b1)(2 - (1 - 2 b3))) / sqrt(10).
+    """
+    m = _bits_per_symbol(mod_type)
+    idx = np.arange(1 << m)
+    bits = (idx[:, None] >> np.arange(m - 1, -1, -1)) & 1
+    s = 1 - 2 * bits
+    if mod_type == "BPSK":
+        lut = s[:, 0].astype(np.complex128)
+    elif mod_type == "QPSK":
+        lut = (s[:, 0] + 1j * s[:, 1]) / np.sqrt(2)
+    else:
+        lut = (s[:, 0] * (2 - s[:, 2]) + 1j * s[:, 1] * (2 - s[:, 3])) * _QAM16_SCALE
+    lut.setflags(write=False)
+    return lut
+
+
+def _bits_per_symbol(mod_type):
+    if mod_type not in MOD_BITS:
+        raise ValueError(f"Unsupported modulation type: {mod_type}. Valid options are {list(MOD_BITS.keys())}.")
+    return MOD_BITS[mod_type]
+
+
+def num_symbols(len_bits, mod_type):
+    m = _bits_per_symbol(mod_type)
+    return -(-len_bits // m)
+
+
+def modulate(bits, mod_type):
+    """
+    Maps a (batch, N) bit array to (batch, ceil(N / m)) complex symbols through the LUT.
+    Frames whose length is not a multiple of m are padded with zero bits.
+    """
+    bits = np.asarray(bits)
+    m = _bits_per_symbol(mod_type)
+    len_bits = bits.shape[-1]
+    pad = (-len_bits) % m
+    if pad:
+        bits = np.concatenate((bits, np.zeros(bits.shape[:-1] + (pad,), dtype=bits.dtype)), axis=-1)
+    groups = bits.reshape(bits.shape[:-1] + (-1, m)).astype(np.intp)
+    idx = groups @ (1 << np.arange(m - 1, -1, -1))
+    return get_constellation(mod_type)[idx]
+
+
+def demodulate(symbols, noise_var, mod_type, demod_type="soft", llr_method="maxlog", len_bits=None):
+    """
+    Computes the LLRs of every bit of every received symbol in closed form.
+
+    Args:
+        symbols (np.ndarray): (batch, n_sym) received complex symbols.
+        noise_var (float): Complex noise variance N0 (N0 / 2 per real dimension).
+        mod_type (str): "BPSK", "QPSK" or "16QAM".
+        demod_type (str): "soft" for LLRs, "hard" for +-HARD_LLR from the hard decisions.
+        llr_method (str): "maxlog" or "exact" (log-sum-exp over the constellation).
+            BPSK and QPSK LLRs are the same for both.
+        len_bits (int, optional): Number of bits to keep, dropping modulation padding.
+
+    Returns:
+        np.ndarray: (batch, len_bits) float64 LLRs, log(P(0) / P(1)).
+    """
+    symbols = np.asarray(symbols)
+    m = _bits_per_symbol(mod_type)
+    if demod_type not in DEMOD_TYPES:
+        raise ValueError(f"Unsupported demodulation type: {demod_type}. Valid options are {list(DEMOD_TYPES)}.")
+    if llr_method not in LLR_METHODS:
+        raise ValueError(f"Unsupported LLR method: {llr_method}. Valid options are {list(LLR_METHODS)}.")
+
+    if mod_type == "BPSK":
+        llr = (4 / noise_var) * symbols.real[..., None]
+    elif mod_type == "QPSK":
+        llr = np.stack((symbols.real, symbols.imag), axis=-1) * (2 * np.sqrt(2) / noise_var)
+    elif llr_method == "exact":
+        llr = _llr_exact(symbols, noise_var, mod_type)
+    else:
+        llr = _llr_maxlog_16qam(symbols, noise_var)
+
+    llr = llr.reshape(symbols.shape[:-1] + (symbols.shape[-1] * m,))
+    if len_bits is not None:
+        llr = llr[..., :len_bits]
+    if demod_type == "hard":
+        llr = np.where(llr < 0, -HARD_LLR, HARD_LLR)
+    return llr
+
+
+def _llr_maxlog_16qam(symbols, noise_var):
+    # Per real dimension the 38.211 mapping is a Gray PAM-4 with levels {+-1, +-3} / sqrt(10):
+    # the sign bit has LLR 4x for |x| <= 2 and 8(x - sign(x)) beyond, the magnitude bit 4(2 - |x|),
+    # with x the dimension in units of 1 / sqrt(10). The common factor is 1 / (10 N0).
+    x = np.stack((symbols.real, symbols.imag), axis=-1) * np.sqrt(10)
+    ax = np.abs(x)
+    sign_llr = np.where(ax <= 2, 4 * x, 8 * (x - np.sign(x)))
+    mag_llr = 4 * (2 - ax)
+    scale = 1 / (10 * noise_var)
+    llr = np.empty(symbols.shape + (4,), dtype=np.float64)
+    llr[..., 0] = sign_llr[..., 0] * scale   # b0: sign of I
+    llr[..., 1] = sign_llr[..., 1] * scale   # b1: sign of Q
+    llr[..., 2] = mag_llr[..., 0] * scale    # b2: magnitude of I
+    llr[..., 3] = mag_llr[..., 1] * scale    # b3: magnitude of Q
+    return llr
+
+
+@lru_cache(maxsize=None)
+def _bit_masks(mod_type):
+    m = MOD_BITS[mod_type]
+    idx = np.arange(1 << m)
+    return ((idx[:, None] >> np.arange(m - 1, -1, -1)) & 1).astype(np.bool_)
+
+
+def _llr_exact(symbols, noise_var, mod_type):
+    lut = get_constellation(mod_type)
+    metric = -np.abs(symbols[..., None] - lut) ** 2 / noise_var
+    ones = _bit_masks(mod_type)
+    llr = np.empty(symbols.shape + (ones.shape[1],), dtype=np.float64)
+    for k in range(ones.shape[1]):
+        num = np.logaddexp.reduce(metric[..., ~ones[:, k]], axis=-1)
+        den = np.logaddexp.reduce(metric[..., ones[:, k]], axis=-1)
+        llr[..., k] = num - den
+    return llr
+
+
+def noise_variance(snr_db, sweep_type, code_rate=1.0, mod_type="BPSK"):
+    """
+    Returns the complex noise variance N0 for unit-energy symbols at one sweep point.
+
+    For sweep_type "SNR" the point is Es/N0; for "EbN0" it is Eb/N0, and
+    Es/N0 = Eb/N0 * code_rate * bits_per_symbol.
+    """
+    snr = 10 ** (np.asarray(snr_db, dtype=np.float64) / 10)
+    if sweep_type == "SNR":
+        return 1 / snr
+    if sweep_type == "EbN0":
+        return 1 / (snr * code_rate * _bits_per_symbol(mod_type))
+    raise ValueError(f"Unsupported sweep type: {sweep_type}. Valid options are ['SNR', 'EbN0'].")
@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class OfdmModem:
+    """
+    Batched OFDM modulator/demodulator.
+
+    A (batch, n) array of constellation symbols is zero-padded to a whole number of OFDM
+    symbols, laid out as (batch, n_ofdm, num_subcarriers) and transformed with one
+    orthonormal IFFT over the last axis, so symbol energy and noise variance are the same
+    in both domains. The IFFT writes straight into the body of a preallocated
+    (batch, n_ofdm, num_subcarriers + cyclic_prefix_length) buffer and the CP is filled
+    from its tail; the receiver strips the CP by taking a strided view of the body.
+
+    Args:
+        num_subcarriers (int): FFT size.
+        cyclic_prefix_length (int): CP samples per OFDM symbol.
+    """
+
+    def __init__(self, num_subcarriers, cyclic_prefix_length):
+        if num_subcarriers <= 0:
+            raise ValueError(f"'ofdm.num_subcarriers' ({num_subcarriers}) must be a positive value.")
+        if not 0 <= cyclic_prefix_length <= num_subcarriers:
+            raise ValueError(
+                f"'ofdm.cyclic_prefix_length' ({cyclic_prefix_length}) must be between 0 and "
+                f"'ofdm.num_subcarriers' ({num_subcarriers})."
+            )
+        self.num_subcarriers = num_subcarriers
+        self.cyclic_prefix_length = cyclic_prefix_length
+        self.symbol_length = num_subcarriers + cyclic_prefix_length
+
+    def num_ofdm_symbols(self, len_symbols):
+        return -(-len_symbols // self.num_subcarriers)
+
+    def num_samples(self, len_symbols):
+        """
+        Time-domain samples per frame for `len_symbols` constellation symbols.
+        """
+        return self.num_ofdm_symbols(len_symbols) * self.symbol_length
+
+    def modulate(self, symbols, out=None):
+        """
+        Returns the (batch, n_ofdm * (num_subcarriers + cyclic_prefix_length)) time-domain frames.
+
+        Args:
+            symbols (np.ndarray): (batch, n) complex constellation symbols.
+            out (np.ndarray, optional): complex128 output buffer of the returned shape.
+        """
+        symbols = np.asarray(symbols)
+        batch, len_symbols = symbols.shape
+        nsc, cp = self.num_subcarriers, self.cyclic_prefix_length
+        n_ofdm = self.num_ofdm_symbols(len_symbols)
+
+        if len_symbols == n_ofdm * nsc:
+            grid = symbols.reshape(batch, n_ofdm, nsc)
+        else:
+            grid = np.zeros((batch, n_ofdm * nsc), dtype=np.complex128)
+            grid[:, :len_symbols] = symbols
+            grid = grid.reshape(batch, n_ofdm, nsc)
+
+        if out is None:
+            out = np.empty((batch, n_ofdm * self.symbol_length), dtype=np.complex128)
+        frames = out.reshape(batch, n_ofdm, self.symbol_length)
+        np.fft.ifft(grid, axis=-1, norm="ortho", out=frames[..., cp:])
+        if cp:
+            frames[..., :cp] = frames[..., nsc:]
+        return out
+
+    def demodulate(self, samples, len_symbols):
+        """
+        Returns the (batch, len_symbols) received constellation symbols, padding removed.
+        """
+        samples = np.asarray(samples)
+        batch = samples.shape[0]
+        frames = samples.reshape(batch, -1, self.symbol_length)
+        grid = np.fft.fft(frames[..., self.cyclic_prefix_length:], axis=-1, norm="ortho")
+        return grid.reshape(batch, -1)[:, :len_symbols]
+
+
+def ofdm_from_config(config_ofdm):
+    """
+    Returns the OfdmModem of a validated `ofdm` section.
+    """
+    return OfdmModem(config_ofdm["num_subcarriers"], config_ofdm["cyclic_prefix_length"])
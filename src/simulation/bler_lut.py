@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import hashlib
+import numpy as np
+from src.coding.polar.decoder import decoder_label
+
+# Table key columns of the results store: everything about the link that changes its
+# BLER curve, so that no two different codes or receivers are pooled into one table.
+LUT_KEY = (
+    "len_n", "len_k", "crc_length", "decoder", "mod_type", "demod_type", "llr_method", "rel_hash", "quantize",
+    "fast_enable",
+)
+
+# Simulation modes whose points are plain Monte-Carlo counts and go into the tables.
+# Importance-sampling estimates ("is") are left out.
+TABLE_MODES = ("rel", "dev", "allzero", "compare")
+
+# Floor of the stored log10(BLER), for points that saw no errors.
+MIN_LOG_BLER = -12.0
+
+
+def code_identity(config_code):
+    """
+    Code-identity columns of a validated `code` section, beyond N, K and the CRC:
+    `rel_hash`, a short hash of the reliability sequence; `quantize`, "off" or the
+    channel/internal/fractional bits; and `fast_enable`.
+    """
+    polar = config_code["polar"]
+    rel_idx = np.ascontiguousarray(polar["rel_idx"], dtype=np.int64)
+    quantize = polar.get("quantize", {"enable": False})
+    return {
+        "rel_hash": hashlib.sha256(rel_idx.tobytes()).hexdigest()[:16],
+        "quantize": (
+            f"q{quantize['bits_chnl']}.{quantize['bits_intl']}.{quantize['bits_frac']}" if quantize["enable"] else "off"
+        ),
+        "fast_enable": bool(polar.get("fast_enable", False)),
+    }
+
+
+def lut_keys(config):
+    """
+    Table keys of the links of a validated configuration, one per decoder when comparing.
+    """
+    polar, mod = config["code"]["polar"], config["mod"]
+    decoders = polar["decoders"] if config["sim"]["mode"] == "compare" else [polar.get("decoder", {"algorithm": "SC"})]
+    crc = polar.get("crc", {})
+    identity = code_identity(config["code"])
+    return [
+        (
+            polar["len_n"], config["code"]["len_k"], crc.get("length", 0) if crc.get("enable") else 0,
+            decoder_label(dec), mod["type"], mod["demod_type"], mod.get("llr_method", "maxlog"),
+            identity["rel_hash"], identity["quantize"], identity["fast_enable"],
+        )
+        for dec in decoders
+    ]
+
+
+def _normalize_key(key):
+    len_n, len_k, crc_length, decoder, mod_type, demod_type, llr_method, rel_hash, quantize, fast = key
+    return (
+        int(len_n), int(len_k), int(crc_length), str(decoder), str(mod_type), str(demod_type), str(llr_method),
+        str(rel_hash), str(quantize), bool(fast),
+    )
+
+
+class BlerTable:
+    """
+    BLER versus SNR of one link (code, decoder and receiver), for link abstraction.
+
+    BLER is interpolated linearly in log10 over SNR, which follows the waterfall far
+    better than linear interpolation. Queries outside the simulated range are clamped to
+    the first or last point. Points without errors are kept at `MIN_LOG_BLER`.
+
+    Args:
+        key (tuple): Values of the `LUT_KEY` columns, see `lut_keys`.
+        snr (array_like): Simulated SNR values, in the unit of `sweep_type`.
+        bler (array_like): BLER at every value of `snr`.
+        frames (array_like): Frames behind every point.
+        sweep_type (str): "SNR" or "EbN0".
+    """
+
+    def __init__(self, key, snr, bler, frames, sweep_type="SNR"):
+        order = np.argsort(snr, kind="stable")
+        self.key = _normalize_key(key)
+        self.sweep_type = sweep_type
+        self.snr = np.asarray(snr, dtype=np.float64)[order]
+        self.log_bler = np.log10(np.maximum(np.asarray(bler, dtype=np.float64)[order], 10.0 ** MIN_LOG_BLER))
+        self.frames = np.asarray(frames, dtype=np.int64)[order]
+
+    def bler(self, snr):
+        """
+        Interpolated BLER at every value of `snr` (scalar or array).
+        """
+        return 10.0 ** np.interp(snr, self.snr, self.log_bler)
+
+    def missing(self, snr, max_step=None):
+        """
+        Values of `snr` the table does not cover: outside its range, or, with `max_step`,
+        inside a gap between simulated points wider than `max_step`.
+        """
+        snr = np.atleast_1d(np.asarray(snr, dtype=np.float64))
+        uncovered = (snr < self.snr[0]) | (snr > self.snr[-1])
+        if max_step is not None and len(self.snr) > 1:
+            idx = np.clip(np.searchsorted(self.snr, snr), 1, len(self.snr) - 1)
+            gap = self.snr[idx] - self.snr[idx - 1]
+            uncovered |= (gap > max_step) & ~np.isin(snr, self.snr)
+        return snr[uncovered]
+
+    def save(self, path):
+        """
+        Writes the table as an uncompressed .npz: three arrays of one entry per point and
+        the key and sweep type as JSON.
+        """
+        meta = json.dumps({"key": list(self.key), "sweep_type": self.sweep_type})
+        np.savez(path, snr=self.snr, log_bler=self.log_bler, frames=self.frames, meta=np.array(meta))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(meta["key"], data["snr"], 10.0 ** data["log_bler"], data["frames"], meta["sweep_type"])
+
+
+def tables_from_points(points, sweep_type="SNR"):
+    """
+    Builds one `BlerTable` per link, i.e. per distinct `LUT_KEY`, from stored points.
+
+    Points of the same link at the same SNR, from any number of runs, are pooled
+    weighted by their frames, i.e. the total frame errors over the total frames.
+
+    Args:
+        points (pandas.DataFrame): Rows of `ResultsStore.query`, one `sweep_type` only.
+            Rows without a complete key (stored before a column existed) and, if a
+            `mode` column is present, rows outside `TABLE_MODES` are skipped.
+        sweep_type (str): Unit of the SNR values.
+
+    Returns:
+        dict: `BlerTable` by key tuple.
+    """
+    tables = {}
+    if "mode" in points:
+        points = points[points["mode"].isin(TABLE_MODES)]
+    if points.empty:
+        return tables
+    points = points.assign(weighted=points["bler"] * points["frames"])
+    pooled = points.groupby(list(LUT_KEY) + ["snr_point"], as_index=False)[["weighted", "frames"]].sum()
+    for key, group in pooled.groupby(list(LUT_KEY)):
+        key = _normalize_key(key)
+        bler = group["weighted"].to_numpy() / group["frames"].to_numpy()
+        tables[key] = BlerTable(key, group["snr_point"].to_numpy(), bler, group["frames"].to_numpy(), sweep_type)
+    return tables
+
+
+def _file_name(key):
+    len_n, len_k, crc_length, decoder, mod_type, demod_type, llr_method, rel_hash, quantize, fast = key
+    name = f"n{len_n}_k{len_k}_crc{crc_length}_{decoder}_{mod_type}_{demod_type}_{llr_method}_{rel_hash}_{quantize}"
+    name += "_fast" if fast else ""
+    return re.sub(r"[^A-Za-z0-9_.=-]", "_", name) + ".npz"
+
+
+class BlerLut:
+    """
+    Collection of `BlerTable`s that stands in for link simulation in system-level
+    studies: `bler` answers a whole array of SNR values with one table lookup.
+
+    Args:
+        tables (dict, optional): `BlerTable` by key, see `lut_keys`.
+        sweep_type (str): Unit of the SNR values of every table.
+    """
+
+    def __init__(self, tables=None, sweep_type="SNR"):
+        self.tables = dict(tables or {})
+        self.sweep_type = sweep_type
+
+    @classmethod
+    def from_store(cls, store, sweep_type="SNR", **filters):
+        """
+        Builds the tables from every stored Monte-Carlo point (`TABLE_MODES`) of
+        `sweep_type`; `filters` narrow the points further, as in `ResultsStore.query`.
+        """
+        points = store.query(
+            columns=list(LUT_KEY) + ["snr_point", "bler", "frames"],
+            sweep_type=sweep_type, mode=list(TABLE_MODES), **filters,
+        )
+        return cls(tables_from_points(points, sweep_type), sweep_type)
+
+    def bler(self, key, snr):
+        """
+        Interpolated BLER of the link `key` (see `lut_keys`) at every value of `snr`.
+
+        Raises:
+            KeyError: If there is no table for the link; see `missing`.
+        """
+        key = _normalize_key(key)
+        if key not in self.tables:
+            raise KeyError(f"No BLER table for {dict(zip(LUT_KEY, key))}.")
+        return self.tables[key].bler(snr)
+
+    def missing(self, keys, snr, max_step=None):
+        """
+        Entries to simulate before the given links can be looked up over `snr`.
+
+        Args:
+            keys (list): Link keys, see `lut_keys`.
+            snr (array_like): SNR values the study needs.
+            max_step (float, optional): Widest gap between simulated points to accept.
+
+        Returns:
+            dict: For every key with missing entries, the SNR values that are not covered,
+            all of `snr` when the link has no table.
+        """
+        snr = np.atleast_1d(np.asarray(snr, dtype=np.float64))
+        report = {}
+        for key in keys:
+            key = _normalize_key(key)
+            table = self.tables.get(key)
+            uncovered = snr if table is None else table.missing(snr, max_step)
+            if uncovered.size:
+                report[key] = uncovered
+        return report
+
+    def save(self, directory):
+        """
+        Writes one file per table into `directory`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for key, table in self.tables.items():
+            table.save(os.path.join(directory, _file_name(key)))
+
+    @classmethod
+    def load(cls, directory):
+        tables = {}
+        sweep_type = "SNR"
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".npz"):
+                table = BlerTable.load(os.path.join(directory, name))
+                tables[table.key] = table
+                sweep_type = table.sweep_type
+        return cls(tables, sweep_type)
+
+
+def update_lut(config, store):
+    """
+    Rebuilds the tables of the links of a validated configuration (every decoder when
+    comparing) from all points in `store` and saves them under
+    `<store root>/lut/<sweep type>/`. Called after a stored sweep when
+    `sim.save.lutsim_enable` is on.
+
+    Returns:
+        BlerLut: The rebuilt tables.
+    """
+    keys = lut_keys(config)
+    link = dict(zip(LUT_KEY, keys[0]))
+    lut = BlerLut.from_store(
+        store, config["sim"]["sweep_type"], len_n=link["len_n"], len_k=link["len_k"], rel_hash=link["rel_hash"],
+    )
+    lut.tables = {key: lut.tables[key] for key in keys if key in lut.tables}
+    lut.save(os.path.join(store.root, "lut", config["sim"]["sweep_type"]))
+    return lut
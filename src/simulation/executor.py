@@ -0,0 +1,199 @@
+import os
+import math
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from src.simulation.link import LinkSimulator
+from src.simulation.runner import point_done, errors_left, progress_entry, batch_frames, run_sweep
+from src.simulation.sharding import ShardedPointRunner
+from src.simulation.planner import AdaptiveSweepPlanner
+
+# Upper bound on the batches of one task, so progress streams and stopping stays prompt.
+MAX_CHUNK_BATCHES = 8
+
+_WORKER_LINK = None
+
+
+def _init_worker(config):
+    global _WORKER_LINK
+    _WORKER_LINK = LinkSimulator(config)
+
+
+def _run_chunk(snr_idx, snr, first_batch, n_batches, config_loop):
+    """
+    Runs batches first_batch .. first_batch + n_batches - 1 of one point in a worker and
+    returns their (frames, bit errors, frame errors), one tuple per batch.
+    """
+    link = _WORKER_LINK
+    noise_var = link.noise_var(snr)
+    counts = []
+    for batch_idx in range(first_batch, first_batch + n_batches):
+        batch = batch_frames(batch_idx, config_loop)
+        rng = link.channel.generator(snr_idx, 0, batch_idx)
+        n_bit, n_frame = link.run_batch(batch, noise_var, rng)
+        counts.append((batch, n_bit, n_frame))
+    return counts
+
+
+class _PointState:
+    """
+    Coordinator bookkeeping of one SNR point. Batch results are committed strictly in
+    batch order, so the point stops after the same batches as `simulate_point`.
+    """
+
+    def __init__(self, snr_idx, snr):
+        self.snr_idx = snr_idx
+        self.snr = snr
+        self.next_batch = 0
+        self.in_flight = 0
+        self.pending = {}
+        self.committed = 0
+        self.frames = self.bit_errors = self.frame_errors = 0
+        self.done = False
+
+    def commit(self, first_batch, counts, config_loop, len_k):
+        for offset, count in enumerate(counts):
+            self.pending[first_batch + offset] = count
+        while not self.done and self.committed in self.pending:
+            batch, n_bit, n_frame = self.pending.pop(self.committed)
+            self.frames += batch
+            self.bit_errors += n_bit
+            self.frame_errors += n_frame
+            self.committed += 1
+            self.done = point_done(self.frames, self.bit_errors, self.frame_errors, len_k, config_loop)
+
+    def batches_wanted(self, config_loop):
+        """
+        Estimated batches still needed beyond the scheduled ones; 0 if none should be added.
+        A point that is not done and has nothing in flight always wants at least one, so it
+        cannot stall when the estimate falls short of its stop rule.
+        """
+        max_batches = math.ceil(int(config_loop["max_frames"]) / config_loop["batch_size"])
+        left = max_batches - self.next_batch
+        if self.done or left <= 0:
+            return 0
+        need_frames = max(config_loop["num_frames"] - self.frames, 0)
+        n_errors = errors_left(self.frame_errors, config_loop)
+        if n_errors > 0:
+            if self.frame_errors:
+                need_frames = max(need_frames, n_errors * self.frames / self.frame_errors)
+            else:
+                need_frames = max(need_frames, config_loop["batch_size"])
+        scheduled = (self.next_batch - self.committed) * config_loop["batch_size"]
+        wanted = math.ceil(max(need_frames - scheduled, 0) / config_loop["batch_size"])
+        if self.in_flight == 0:
+            wanted = max(wanted, 1)
+        return min(left, wanted)
+
+
+class SweepExecutor:
+    """
+    Simulates the SNR points of a sweep on a process pool.
+
+    Tasks are chunks of consecutive batches of one point. Each worker builds its
+    LinkSimulator once; batch b of point i always draws noise stream (i, 0, b) and has the
+    size given by `batch_frames`, and the coordinator commits a point's batches in order
+    and stops it at the first batch that satisfies `point_done`, so results equal the
+    serial `run_sweep`. Whenever a worker is idle the coordinator hands it a chunk of the
+    unfinished point with the fewest chunks in flight. Once easy points finish, their
+    workers take chunks of the remaining hard points, which splits those budgets over
+    the whole pool.
+
+    Args:
+        config (dict): Validated configuration.
+        max_workers (int, optional): Pool size; `sim.loop.num_workers`, or the CPU count if 0.
+    """
+
+    def __init__(self, config, max_workers=None):
+        self.config = config
+        self.config_loop = config["sim"]["loop"]
+        if max_workers is None:
+            max_workers = self.config_loop.get("num_workers", 0)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _next_task(self, points, idle):
+        candidates = []
+        for state in points:
+            wanted = state.batches_wanted(self.config_loop)
+            if wanted:
+                candidates.append((state.in_flight, state.snr_idx, state, wanted))
+        if not candidates:
+            return None
+        _, _, state, wanted = min(candidates, key=lambda c: c[:2])
+        share = max(1, idle // len(candidates))
+        n_batches = max(1, min(MAX_CHUNK_BATCHES, math.ceil(wanted / share)))
+        first = state.next_batch
+        state.next_batch += n_batches
+        state.in_flight += 1
+        return state, first, n_batches
+
+    def run(self, progress=None, skip_points=()):
+        """
+        Runs the sweep and returns the "perm" progress entry of every point, in point order.
+        `progress` receives "temp" entries as batches are committed and each "perm" entry
+        as soon as its point finishes. Points whose index is in `skip_points` are not run.
+        """
+        simpoints = self.config["sim"]["sweep_vals"]["simpoints"]
+        points = [_PointState(i, float(snr)) for i, snr in enumerate(simpoints) if i not in skip_points]
+        len_k = self.config["code"]["len_k"]
+        results = [None] * len(simpoints)
+        futures = {}
+
+        with ProcessPoolExecutor(self.max_workers, initializer=_init_worker, initargs=(self.config,)) as pool:
+            while True:
+                while len(futures) < self.max_workers:
+                    task = self._next_task(points, self.max_workers - len(futures))
+                    if task is None:
+                        break
+                    state, first, n_batches = task
+                    future = pool.submit(_run_chunk, state.snr_idx, state.snr, first, n_batches, self.config_loop)
+                    futures[future] = (state, first)
+                if not futures:
+                    break
+
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    state, first = futures.pop(future)
+                    state.in_flight -= 1
+                    was_done = state.done
+                    state.commit(first, future.result(), self.config_loop, len_k)
+                    if was_done:
+                        continue
+                    kind = "perm" if state.done else "temp"
+                    entry = progress_entry(
+                        state.snr, state.frames, state.bit_errors, state.frame_errors, len_k, kind, self.config_loop
+                    )
+                    if state.done:
+                        results[state.snr_idx] = entry
+                    if progress is not None:
+                        progress(entry)
+
+        unfinished = [state.snr for state in points if results[state.snr_idx] is None]
+        if unfinished:
+            raise RuntimeError(f"Sweep ended without a result for the points {unfinished}.")
+        return [entry for entry in results if entry is not None]
+
+
+def run_simulation(config, progress=None, skip_points=(), prior=()):
+    """
+    Runs a validated configuration: serially with `sim.loop.num_workers` 1 or in the
+    importance-sampling and decoder comparison modes; otherwise across points on a
+    process pool, or with `sim.loop.parallel` "frames" one point at a time sharded over
+    the workers. Adaptive sweeps (`sim.sweep_vals.adaptive`) run their points in planning
+    order.
+
+    Args:
+        config (dict): Validated configuration.
+        progress (callable, optional): Receives every progress entry.
+        skip_points (set): Indices of `simpoints` that are already finished.
+        prior (list): Their "perm" entries, which adaptive sweeps plan from.
+
+    Returns:
+        list: The "perm" entries of the points run here (adaptive sweeps include `prior`).
+    """
+    config_loop = config["sim"]["loop"]
+    if config["sim"]["sweep_vals"].get("adaptive", False):
+        return AdaptiveSweepPlanner(config).run(progress, prior)
+    if config_loop.get("num_workers", 0) == 1 or config["sim"]["mode"] in ("is", "compare"):
+        return run_sweep(config, progress, skip_points)
+    if config_loop.get("parallel", "points") == "frames":
+        return ShardedPointRunner(config).run(progress, skip_points)
+    return SweepExecutor(config).run(progress, skip_points)
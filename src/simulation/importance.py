@@ -0,0 +1,189 @@
+import math
+import warnings
+import numpy as np
+from statistics import NormalDist
+from src.coding.polar.encoder import polar_encode_batch
+from src.modulation.modulation import modulate, demodulate
+from src.utils.bits.packed_bits import count_bit_errors
+
+IS_METHODS = ("shift", "scale")
+
+# Distance from every constellation point to its nearest decision boundary, per real
+# dimension, for unit-energy symbols.
+_HALF_DISTANCE = {
+    "BPSK": 1.0,
+    "QPSK": 1 / np.sqrt(2),
+    "16QAM": 1 / np.sqrt(10),
+}
+
+
+def biased_noise(symbols, noise_var, rng, mod_type, method, bias):
+    """
+    Draws the noise of a batch from the biased distribution q and returns it with the
+    log likelihood ratio log(p / q) of every frame.
+
+    `bias` describes the whole frame, spread over its D biased real dimensions so that
+    the variance of log(p / q) does not grow with the frame length. "shift" moves the
+    noise mean toward the origin by a vector of norm bias * (distance of a symbol to its
+    nearest decision boundary), i.e. bias / sqrt(D) of that distance in every dimension,
+    giving a log-weight variance of (bias * distance / sigma)^2. "scale" multiplies the
+    noise variance of every dimension by 1 + (bias^2 - 1) / sqrt(D), which keeps the
+    log-weight variance at about (bias^2 - 1)^2 / 2. The imaginary part of BPSK carries
+    no bits and keeps unbiased noise, which contributes nothing to the ratio.
+
+    Returns:
+        tuple: (noise (batch, n_sym) complex128, log_weight (batch,) float64).
+    """
+    sigma = np.sqrt(noise_var / 2)
+    noise = rng.standard_normal(symbols.shape + (2,))
+    n_dims = 1 if mod_type == "BPSK" else 2
+    active = noise[..., :n_dims]
+    noise[..., n_dims:] *= sigma
+    count = active.shape[-2] * n_dims
+
+    if method == "shift":
+        parts = np.stack((symbols.real, symbols.imag), axis=-1)[..., :n_dims]
+        shift = -bias / math.sqrt(count) * _HALF_DISTANCE[mod_type] * np.sign(parts)
+        active *= sigma
+        active += shift
+        log_weight = ((shift * shift - 2 * active * shift) / (2 * sigma * sigma)).sum(axis=(-2, -1))
+    else:
+        scale = math.sqrt(1 + (bias * bias - 1) / math.sqrt(count))
+        active *= sigma * scale
+        sq = (active * active).sum(axis=(-2, -1))
+        log_weight = count * math.log(scale) - sq / (2 * sigma * sigma) * (1 - 1 / (scale * scale))
+
+    return noise[..., 0] + 1j * noise[..., 1], log_weight
+
+
+def run_batch_is(link, batch, noise_var, rng, config_is):
+    """
+    Simulates `batch` frames of `link` with biased noise.
+
+    The noise is added to the constellation symbols directly: the orthonormal OFDM
+    transform is unitary and the CP is discarded, so this has the same distribution as
+    noise added in the time domain.
+
+    Returns:
+        tuple: (weights (batch,), bit errors (batch,)) of every frame.
+    """
+    info = rng.integers(0, 2, size=(batch, link.len_k), dtype=np.uint8)
+    symbols = modulate(polar_encode_batch(info, link.plan), link.mod_type)
+    noise, log_weight = biased_noise(symbols, noise_var, rng, link.mod_type, config_is["method"], config_is["bias"])
+    llr = demodulate(symbols + noise, noise_var, link.mod_type, link.demod_type, link.llr_method, link.plan.len_n)
+    errors = count_bit_errors(info, link.decoder.decode_info(llr)[:, :link.len_k])
+    return np.exp(log_weight), errors
+
+
+class ImportanceEstimate:
+    """
+    Running weighted sums of an importance-sampling point: the BLER estimate is the mean
+    of w * 1[frame error], the BER estimate the mean of w * bit errors / len_k, and their
+    variances are the sample variances of those terms over the frame count.
+
+    The effective sample size (sum w)^2 / sum w^2 tells how many frames the estimate is
+    really worth: when a few large weights dominate it collapses, and the sample variances
+    (hence the intervals) can no longer be trusted.
+    """
+
+    def __init__(self, len_k):
+        self.len_k = len_k
+        self.frames = 0
+        self.frame_errors = 0
+        self.bit_errors = 0
+        self.sums = np.zeros(4)  # sum wI, sum (wI)^2, sum we, sum (we)^2
+        self.weight_sums = np.zeros(2)  # sum w, sum w^2
+
+    def update(self, weights, errors):
+        frame_terms = weights * (errors > 0)
+        bit_terms = weights * errors
+        self.sums += (frame_terms.sum(), (frame_terms ** 2).sum(), bit_terms.sum(), (bit_terms ** 2).sum())
+        self.weight_sums += (weights.sum(), (weights ** 2).sum())
+        self.frames += len(weights)
+        self.frame_errors += int(np.count_nonzero(errors))
+        self.bit_errors += int(errors.sum())
+
+    def estimates(self):
+        """
+        Returns (ber, ber_var, bler, bler_var).
+        """
+        n = max(self.frames, 1)
+        bler = self.sums[0] / n
+        bler_var = max(self.sums[1] / n - bler * bler, 0.0) / n
+        mean_bits = self.sums[2] / n
+        bits_var = max(self.sums[3] / n - mean_bits * mean_bits, 0.0) / n
+        return mean_bits / self.len_k, bits_var / self.len_k ** 2, bler, bler_var
+
+    def ess(self):
+        """
+        Effective sample size (sum w)^2 / sum w^2 of the frames so far.
+        """
+        if self.weight_sums[1] == 0:
+            return 0.0
+        return float(self.weight_sums[0] ** 2 / self.weight_sums[1])
+
+    def relative_half_width(self, confidence):
+        ber, ber_var, bler, bler_var = self.estimates()
+        if bler == 0 or ber == 0:
+            return math.inf
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return max(z * math.sqrt(bler_var) / bler, z * math.sqrt(ber_var) / ber)
+
+    def entry(self, snr, kind, confidence):
+        ber, ber_var, bler, bler_var = self.estimates()
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return {
+            "snr_point": float(snr),
+            "ber": float(ber),
+            "bler": float(bler),
+            "ber_var": float(ber_var),
+            "bler_var": float(bler_var),
+            "ber_ci": [max(0.0, ber - z * math.sqrt(ber_var)), ber + z * math.sqrt(ber_var)],
+            "bler_ci": [max(0.0, bler - z * math.sqrt(bler_var)), bler + z * math.sqrt(bler_var)],
+            "frames": int(self.frames),
+            "bit_errors": int(self.bit_errors),
+            "frame_errors": int(self.frame_errors),
+            "ess": self.ess(),
+            "type": kind,
+        }
+
+
+def simulate_point_is(link, snr_idx, snr, config_loop, config_is, progress=None):
+    """
+    Importance-sampling counterpart of `simulate_point`.
+
+    The point runs at least `num_frames` frames and stops once the normal-approximation
+    intervals of both estimates at `ci_confidence` have a relative half-width of at most
+    `ci_rel_width`, or at `max_frames`. Error counts under the biased noise say nothing
+    about precision, so `num_errors` is not used. Nor does the point stop while its
+    effective sample size is below `min_ess` times the frames drawn: the intervals are
+    not trustworthy then, and a point that reaches `max_frames` in that state warns.
+    Entries report the unbiased estimates with their variances in `ber_var` and
+    `bler_var` and the effective sample size in `ess`; `bit_errors` and `frame_errors`
+    are the raw counts under the biased noise.
+    """
+    noise_var = link.noise_var(snr)
+    estimate = ImportanceEstimate(link.len_k)
+    confidence = config_loop["ci_confidence"]
+    max_frames = int(config_loop["max_frames"])
+    batch_idx = 0
+    while estimate.frames < max_frames:
+        if (
+            estimate.frames >= config_loop["num_frames"]
+            and estimate.ess() >= config_is["min_ess"] * estimate.frames
+            and estimate.relative_half_width(confidence) <= config_loop["ci_rel_width"]
+        ):
+            break
+        batch = min(config_loop["batch_size"], max_frames - estimate.frames)
+        rng = link.channel.generator(snr_idx, 0, batch_idx)
+        estimate.update(*run_batch_is(link, batch, noise_var, rng, config_is))
+        batch_idx += 1
+        if progress is not None:
+            progress(estimate.entry(snr, "temp", confidence))
+    if estimate.ess() < config_is["min_ess"] * estimate.frames:
+        warnings.warn(
+            f"Importance sampling at {snr} collapsed: effective sample size {estimate.ess():.1f} of "
+            f"{estimate.frames} frames. Its estimate is unreliable; lower 'sim.importance.bias'.",
+            RuntimeWarning,
+        )
+    return estimate.entry(snr, "perm", confidence)
@@ -0,0 +1,135 @@
+import numpy as np
+from src.coding.polar.code_plan import plan_from_config
+from src.coding.polar.decoder import build_decoder, decoder_label
+from src.coding.polar.encoder import polar_encode_batch
+from src.modulation.modulation import modulate, demodulate, noise_variance, num_symbols
+from src.modulation.ofdm import ofdm_from_config
+from src.channel.channel import channel_from_config
+from src.utils.bits.packed_bits import count_errors, count_bit_errors
+
+# Modulations whose demappers give bit LLRs with a codeword-independent distribution
+# over AWGN (BPSK and Gray QPSK with soft or hard demapping). The 16QAM magnitude bits
+# are not symmetric, so their error rate depends on the transmitted codeword.
+SYMMETRIC_MODULATIONS = ("BPSK", "QPSK")
+
+
+def check_allzero_symmetric(config):
+    """
+    Raises ValueError unless the all-zero codeword gives the same error rates as random
+    codewords for this configuration: a symmetric modulation and demapper, and float
+    decoding (the fixed-point quantizer saturates asymmetrically and breaks ties toward 0).
+    """
+    mod_type = config["mod"]["type"]
+    if mod_type not in SYMMETRIC_MODULATIONS:
+        raise ValueError(
+            f"'sim.mode' allzero needs a symmetric modulation, got 'mod.type' {mod_type}. "
+            f"Valid options are {list(SYMMETRIC_MODULATIONS)}."
+        )
+    quantize = config["code"].get("polar", {}).get("quantize", {})
+    if quantize.get("enable", False):
+        raise ValueError("'sim.mode' allzero is not supported with 'polar.quantize.enable'.")
+
+
+class LinkSimulator:
+    """
+    The full link of one configuration, run a batch of frames at a time.
+
+    Random information bits are CRC-attached and polar-encoded, mapped to symbols, sent
+    through OFDM and the AWGN channel, demapped and decoded. In the `allzero` mode the
+    all-zero codeword is sent instead: its time-domain frame is computed once, and bit
+    errors are the ones in the decoder's hard decisions on the information bits.
+
+    Args:
+        config (dict): Validated configuration.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.plan = plan_from_config(config["code"])
+        self.decoder = build_decoder(config["code"], self.plan)
+        self.mod_type = config["mod"]["type"]
+        self.demod_type = config["mod"]["demod_type"]
+        self.llr_method = config["mod"]["llr_method"]
+        self.ofdm = ofdm_from_config(config["ofdm"])
+        self.channel = channel_from_config(config["channel"])
+        self.sweep_type = config["sim"]["sweep_type"]
+        self.allzero = config["sim"]["mode"] == "allzero"
+        self.len_k = self.plan.len_k
+        self.len_symbols = num_symbols(self.plan.len_n, self.mod_type)
+        self._zero_frame = None
+        self.compare_decoders = []
+        self.compare_labels = []
+        if config["sim"]["mode"] == "compare":
+            for config_dec in config["code"]["polar"]["decoders"]:
+                self.compare_decoders.append(build_decoder(config["code"], self.plan, config_dec))
+                self.compare_labels.append(decoder_label(config_dec))
+
+    def noise_var(self, snr):
+        """
+        Complex noise variance of one sweep point, computed once per point.
+        """
+        return float(noise_variance(snr, self.sweep_type, self.plan.rate, self.mod_type))
+
+    def frame_bytes(self):
+        """
+        Rough peak memory of one frame in flight, in bytes, for batch-size ceilings: the
+        time-domain and LLR arrays of the link plus the decoder's per-frame state.
+        """
+        len_n = self.plan.len_n
+        n_samples = self.ofdm.num_samples(self.len_symbols)
+        llr_bytes = np.dtype(getattr(self.decoder, "dtype", np.float64)).itemsize
+        paths = getattr(self.decoder, "list_size", 1)
+        link_bytes = 3 * 16 * n_samples + 3 * 8 * len_n + 2 * len_n
+        decoder_bytes = paths * (2 * len_n * (llr_bytes + 1) + 3 * self.plan.len_info) + len_n * (llr_bytes + 1)
+        return link_bytes + decoder_bytes
+
+    def _zero_samples(self):
+        if self._zero_frame is None:
+            codeword = np.zeros((1, self.plan.len_n), dtype=np.uint8)
+            self._zero_frame = self.ofdm.modulate(modulate(codeword, self.mod_type))
+        return self._zero_frame
+
+    def receive(self, samples, noise_var, rng, out=None):
+        """
+        Adds channel noise to the (batch, n_samples) frames and returns their channel LLRs,
+        written into `out` when it is given.
+        """
+        rx = self.channel.transmit(samples, noise_var, rng)
+        symbols = self.ofdm.demodulate(rx, self.len_symbols)
+        llr = demodulate(symbols, noise_var, self.mod_type, self.demod_type, self.llr_method, self.plan.len_n)
+        if out is None:
+            return llr
+        out[...] = llr
+        return out
+
+    def run_batch(self, batch, noise_var, rng, llr_out=None):
+        """
+        Simulates `batch` frames and returns their (bit errors, frame errors) on the len_k
+        information bits. `llr_out` is an optional (batch, N) buffer for the channel LLRs.
+        """
+        if self.allzero:
+            frame = self._zero_samples()
+            samples = np.broadcast_to(frame, (batch, frame.shape[1]))
+            llr = self.receive(samples, noise_var, rng, out=llr_out)
+            errors = np.count_nonzero(self.decoder.decode_info(llr)[:, :self.len_k], axis=1)
+            return int(errors.sum()), int(np.count_nonzero(errors))
+
+        info = rng.integers(0, 2, size=(batch, self.len_k), dtype=np.uint8)
+        codewords = polar_encode_batch(info, self.plan)
+        samples = self.ofdm.modulate(modulate(codewords, self.mod_type))
+        llr = self.receive(samples, noise_var, rng, out=llr_out)
+        return count_errors(info, self.decoder.decode_info(llr)[:, :self.len_k])
+
+    def run_batch_compare(self, batch, noise_var, rng, llr_out=None):
+        """
+        Simulates `batch` frames once and decodes the same channel LLR buffer with every
+        decoder of `polar.decoders` in turn.
+
+        Returns:
+            list: The (batch,) bit error counts of every frame, one array per decoder.
+        """
+        info = rng.integers(0, 2, size=(batch, self.len_k), dtype=np.uint8)
+        codewords = polar_encode_batch(info, self.plan)
+        samples = self.ofdm.modulate(modulate(codewords, self.mod_type))
+        llr = self.receive(samples, noise_var, rng, out=llr_out)
+        return [count_bit_errors(info, decoder.decode_info(llr)[:, :self.len_k]) for decoder in self.compare_decoders]
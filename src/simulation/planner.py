@@ -0,0 +1,143 @@
+import time
+import numpy as np
+from src.simulation.link import LinkSimulator
+from src.simulation.runner import run_point
+
+
+def _log_bler(results):
+    snrs = np.array([entry["snr_point"] for entry in results])
+    bler = np.array([entry["bler"] for entry in results])
+    return snrs, np.log10(np.maximum(bler, 1e-300)), bler > 0
+
+
+def _free(snr, snrs, min_step):
+    return bool(np.all(np.abs(snrs - snr) >= min_step - 1e-12))
+
+
+def next_points(results, target_blers, min_step, step=None):
+    """
+    Picks the next points to simulate from the finished ones.
+
+    The measured curve is the piecewise-linear fit of log10(BLER) over SNR. For every
+    target BLER whose crossing lies between two finished points, the crossing is
+    interpolated (the midpoint when the higher point saw no errors) and proposed, until
+    the crossing is bracketed by points at most 2 * `min_step` apart. A target that the
+    finished points do not bracket extends the grid by `step`: past the highest point
+    when even that one is above the target, below the lowest point when that one is
+    already under it. Without anything left to propose, the midpoint next to the point
+    of largest bend, the second difference of log10(BLER), is proposed. Points closer
+    than `min_step` to a finished point are never proposed.
+
+    Args:
+        results (list): "perm" entries of the finished points.
+        target_blers (list): BLER values whose SNR should be resolved.
+        min_step (float): Smallest spacing between points.
+        step (float, optional): Grid extension step; `min_step` by default.
+
+    Returns:
+        list: SNR values to simulate next, possibly empty.
+    """
+    results = sorted(results, key=lambda entry: entry["snr_point"])
+    snrs, log_bler, seen = _log_bler(results)
+    step = max(step or min_step, min_step)
+    proposals = []
+
+    def propose(snr):
+        if _free(snr, snrs, min_step) and all(abs(snr - p) >= min_step for p in proposals):
+            proposals.append(float(snr))
+
+    for target in np.log10(np.asarray(target_blers, dtype=np.float64)):
+        bracketed = False
+        for i in range(len(snrs) - 1):
+            if not (seen[i] and log_bler[i] > target and (not seen[i + 1] or log_bler[i + 1] <= target)):
+                continue
+            bracketed = True
+            if snrs[i + 1] - snrs[i] <= 2 * min_step + 1e-12:
+                continue  # resolved: nothing fits between the bracketing points
+            if seen[i + 1] and log_bler[i + 1] < log_bler[i]:
+                frac = (log_bler[i] - target) / (log_bler[i] - log_bler[i + 1])
+                propose(snrs[i] + frac * (snrs[i + 1] - snrs[i]))
+            else:
+                propose(0.5 * (snrs[i] + snrs[i + 1]))
+        if bracketed or not len(snrs):
+            continue
+        if seen[-1] and log_bler[-1] > target:
+            propose(snrs[-1] + step)
+        elif not seen[0] or log_bler[0] < target:
+            propose(snrs[0] - step)
+    if proposals:
+        return proposals
+
+    if len(snrs) >= 3 and np.count_nonzero(seen) >= 3:
+        idx = np.flatnonzero(seen)
+        s, y = snrs[idx], log_bler[idx]
+        slopes = np.diff(y) / np.diff(s)
+        bend = np.abs(np.diff(slopes))
+        for j in np.argsort(-bend, kind="stable"):
+            # The bend at point j + 1 is resolved by halving its wider neighbouring interval.
+            lo, hi = (s[j], s[j + 1]) if s[j + 1] - s[j] >= s[j + 2] - s[j + 1] else (s[j + 1], s[j + 2])
+            snr = 0.5 * (lo + hi)
+            if _free(snr, snrs, min_step):
+                return [float(snr)]
+    return []
+
+
+class AdaptiveSweepPlanner:
+    """
+    Chooses the SNR points of a sweep while it runs.
+
+    The coarse `simpoints` grid is simulated first; `next_points` then proposes target
+    BLER crossings, grid extensions by `step` toward targets outside the simulated range
+    and high-curvature points, which are simulated in turn until nothing is left to
+    refine, `max_points` points have run, or the `budget_frames` / `budget_seconds`
+    budget of `sim.sweep_vals` is spent (0 disables a budget). Each point may use at
+    most the frames left in the budget. Points are numbered in the order
+    they run, which sets their noise streams, and every point streams through the same
+    progress callback as a fixed sweep.
+
+    Args:
+        config (dict): Validated configuration with `sim.sweep_vals.adaptive`.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.config_sim = config["sim"]
+        self.config_sweep = config["sim"]["sweep_vals"]
+
+    def run(self, progress=None, prior=()):
+        """
+        Returns the "perm" entries of every simulated point, sorted by SNR.
+
+        `prior` holds the entries of points finished by an earlier, interrupted run of the
+        same sweep; planning continues from them and they count against the budgets.
+        """
+        link = LinkSimulator(self.config)
+        config_sweep = self.config_sweep
+        budget_frames = config_sweep["budget_frames"]
+        budget_seconds = config_sweep["budget_seconds"]
+        start = time.monotonic()
+        results = list(prior)
+        done = np.array([entry["snr_point"] for entry in results])
+        queue = [float(snr) for snr in config_sweep["simpoints"] if not np.any(np.isclose(done, snr))]
+        if not queue and results:
+            queue = next_points(results, config_sweep["target_blers"], config_sweep["min_step"], config_sweep["step"])
+
+        while queue and len(results) < config_sweep["max_points"]:
+            frames_used = sum(entry["frames"] for entry in results)
+            if budget_frames and frames_used >= budget_frames:
+                break
+            if budget_seconds and time.monotonic() - start >= budget_seconds:
+                break
+            config_loop = dict(self.config_sim["loop"])
+            if budget_frames:
+                config_loop["max_frames"] = min(int(config_loop["max_frames"]), budget_frames - frames_used)
+
+            snr = queue.pop(0)
+            entry = run_point(link, len(results), snr, self.config_sim, config_loop, progress)
+            if progress is not None:
+                progress(entry)
+            results.append(entry)
+            if not queue:
+                queue = next_points(results, config_sweep["target_blers"], config_sweep["min_step"], config_sweep["step"])
+
+        return sorted(results, key=lambda entry: entry["snr_point"])
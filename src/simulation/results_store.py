@@ -0,0 +1,312 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from src.coding.polar.decoder import decoder_label
+from src.simulation.executor import run_simulation
+from src.simulation.bler_lut import update_lut, code_identity
+
+# `sim.loop` keys that only decide how a sweep is executed, not what it computes.
+EXECUTION_KEYS = ("num_workers", "parallel")
+
+POINT_SCHEMA = pa.schema([
+    ("snr_point", pa.float64()),
+    ("ber", pa.float64()),
+    ("bler", pa.float64()),
+    ("frames", pa.int64()),
+    ("bit_errors", pa.int64()),
+    ("frame_errors", pa.int64()),
+    ("ber_ci_low", pa.float64()),
+    ("ber_ci_high", pa.float64()),
+    ("bler_ci_low", pa.float64()),
+    ("bler_ci_high", pa.float64()),
+    ("ber_var", pa.float64()),
+    ("bler_var", pa.float64()),
+    ("discordant_ref", pa.int64()),
+    ("discordant_self", pa.int64()),
+    ("decoder", pa.string()),
+    ("len_n", pa.int64()),
+    ("len_k", pa.int64()),
+    ("crc_length", pa.int64()),
+    ("rel_hash", pa.string()),
+    ("quantize", pa.string()),
+    ("fast_enable", pa.bool_()),
+    ("mod_type", pa.string()),
+    ("demod_type", pa.string()),
+    ("llr_method", pa.string()),
+    ("sweep_type", pa.string()),
+    ("mode", pa.string()),
+    ("seed", pa.int64()),
+    ("finished_at", pa.float64()),
+])
+
+# Columns that are only present in the progress entries of some modes.
+_OPTIONAL_FIELDS = ("ber_var", "bler_var", "discordant_ref", "discordant_self")
+
+
+def _canonical(value):
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def canonical_config(config):
+    """
+    The part of a validated configuration that determines its results, as plain JSON
+    types: `_comments`, `sim.save`, the polar file path (its reliability sequence stays)
+    and the execution-only `sim.loop` keys are dropped. The channel seed is kept.
+    """
+    config = _canonical(config)
+    config.pop("_comments", None)
+    config["code"]["polar"].pop("polar_file", None)
+    config["sim"].pop("save", None)
+    for key in EXECUTION_KEYS:
+        config["sim"]["loop"].pop(key, None)
+    return config
+
+
+def config_key(config):
+    """
+    Content address of a validated configuration: the SHA-256 of its canonical JSON.
+    """
+    text = json.dumps(canonical_config(config), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def points_per_snr(config):
+    """
+    Progress entries one SNR point yields: one per decoder when comparing, else one.
+    """
+    if config["sim"]["mode"] == "compare":
+        return len(config["code"]["polar"]["decoders"])
+    return 1
+
+
+class ResultsStore:
+    """
+    Local Parquet store of finished SNR points, keyed by `config_key`.
+
+    Every "perm" entry is written to its own file under
+    `<root>/points/config_hash=<key>/` as soon as its point finishes, so a killed sweep
+    loses at most the points in flight; files are renamed into place once complete.
+    Rows carry the code (with `code_identity`), decoder and modulation parameters next to
+    the counters, so past runs can be filtered without their configurations.
+    `<root>/configs/<key>.json` keeps the canonical configuration and whether its sweep
+    ran to the end.
+
+    Args:
+        root (str): Directory of the store, created on first write.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.points_dir = os.path.join(root, "points")
+        self.configs_dir = os.path.join(root, "configs")
+
+    def _config_path(self, key):
+        return os.path.join(self.configs_dir, f"{key}.json")
+
+    def _write_config(self, key, config, complete):
+        os.makedirs(self.configs_dir, exist_ok=True)
+        tmp = self._config_path(key) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"config": canonical_config(config), "complete": complete}, f, sort_keys=True)
+        os.replace(tmp, self._config_path(key))
+
+    def _row(self, entry, config):
+        code, polar, mod = config["code"], config["code"]["polar"], config["mod"]
+        crc = polar.get("crc", {})
+        row = {
+            "snr_point": entry["snr_point"],
+            "ber": entry["ber"],
+            "bler": entry["bler"],
+            "frames": entry["frames"],
+            "bit_errors": entry["bit_errors"],
+            "frame_errors": entry["frame_errors"],
+            "ber_ci_low": entry["ber_ci"][0],
+            "ber_ci_high": entry["ber_ci"][1],
+            "bler_ci_low": entry["bler_ci"][0],
+            "bler_ci_high": entry["bler_ci"][1],
+            "decoder": entry.get("decoder") or decoder_label(polar.get("decoder", {"algorithm": "SC"})),
+            "len_n": polar["len_n"],
+            "len_k": code["len_k"],
+            "crc_length": crc.get("length", 0) if crc.get("enable") else 0,
+            "mod_type": mod["type"],
+            "demod_type": mod["demod_type"],
+            "llr_method": mod.get("llr_method", "maxlog"),
+            "sweep_type": config["sim"]["sweep_type"],
+            "mode": config["sim"]["mode"],
+            "seed": config["channel"]["seed"],
+            "finished_at": time.time(),
+        }
+        row.update(code_identity(code))
+        for field in _OPTIONAL_FIELDS:
+            row[field] = entry.get(field)
+        return row
+
+    def append_point(self, key, entry, config):
+        """
+        Persists the "perm" entry of one finished point of the sweep `key`.
+        """
+        if not os.path.exists(self._config_path(key)):
+            self._write_config(key, config, complete=False)
+        directory = os.path.join(self.points_dir, f"config_hash={key}")
+        os.makedirs(directory, exist_ok=True)
+        # Names sort in write order, which `load_points` relies on.
+        path = os.path.join(directory, f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet")
+        table = pa.Table.from_pylist([self._row(entry, config)], schema=POINT_SCHEMA)
+        pq.write_table(table, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    def load_points(self, key):
+        """
+        Returns the stored "perm" entries of the sweep `key` in write order.
+        """
+        directory = os.path.join(self.points_dir, f"config_hash={key}")
+        if not os.path.isdir(directory):
+            return []
+        files = sorted(name for name in os.listdir(directory) if name.endswith(".parquet"))
+        if not files:
+            return []
+        table = ds.dataset([os.path.join(directory, name) for name in files], schema=POINT_SCHEMA).to_table()
+        compare = table.num_rows > 0 and table.column("mode")[0].as_py() == "compare"
+        entries = []
+        for row in table.to_pylist():
+            entry = {
+                "snr_point": row["snr_point"],
+                "ber": row["ber"],
+                "bler": row["bler"],
+                "frames": row["frames"],
+                "bit_errors": row["bit_errors"],
+                "frame_errors": row["frame_errors"],
+                "type": "perm",
+                "ber_ci": [row["ber_ci_low"], row["ber_ci_high"]],
+                "bler_ci": [row["bler_ci_low"], row["bler_ci_high"]],
+            }
+            if compare:
+                entry["decoder"] = row["decoder"]
+            for field in _OPTIONAL_FIELDS:
+                if row[field] is not None:
+                    entry[field] = row[field]
+            entries.append(entry)
+        return entries
+
+    def is_complete(self, key):
+        try:
+            with open(self._config_path(key)) as f:
+                return json.load(f)["complete"]
+        except FileNotFoundError:
+            return False
+
+    def mark_complete(self, key, config):
+        self._write_config(key, config, complete=True)
+
+    def query(self, columns=None, **equals):
+        """
+        Filtered read over every stored point, e.g. `query(len_n=1024, mod_type="QPSK")`.
+        A list value matches any of its elements. `config_hash` is a column too.
+
+        Returns:
+            pandas.DataFrame: One row per stored point.
+        """
+        schema = POINT_SCHEMA.append(pa.field("config_hash", pa.string()))
+        if not os.path.isdir(self.points_dir):
+            table = schema.empty_table()
+            return (table.select(columns) if columns else table).to_pandas()
+        dataset = ds.dataset(self.points_dir, format="parquet", schema=schema, partitioning="hive")
+        expr = None
+        for name, value in equals.items():
+            if name not in schema.names:
+                raise ValueError(f"Invalid results column: {name}. Valid options are {schema.names}.")
+            # An OR of equalities rather than `isin`, whose statistics pruning drops
+            # single-row files holding 0.0.
+            term = None
+            for v in value if isinstance(value, (list, tuple)) else [value]:
+                term = ds.field(name) == v if term is None else term | (ds.field(name) == v)
+            expr = term if expr is None else expr & term
+        return dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+
+def store_from_config(config):
+    """
+    The store selected by `sim.save`, or None when `save_output` is off.
+    """
+    config_save = config["sim"]["save"]
+    if not config_save["save_output"]:
+        return None
+    return ResultsStore(config_save["results_dir"])
+
+
+def _simpoint_index(simpoints, snr):
+    matches = np.flatnonzero(np.isclose(simpoints, snr))
+    return int(matches[0]) if matches.size else -1
+
+
+def run_stored(config, store, progress=None):
+    """
+    Runs a sweep through `store`: a sweep that already ran to the end with the same
+    `config_key` is replayed from the store without simulating; an interrupted one
+    resumes, skipping the points it finished; every new "perm" entry is persisted as soon
+    as its point finishes. With `sim.save.lutsim_enable`, the BLER tables of the link are
+    rebuilt once the sweep is complete.
+
+    Args:
+        config (dict): Validated configuration.
+        store (ResultsStore): Store to read and append to.
+        progress (callable, optional): Receives every progress entry, stored "perm"
+            entries included.
+
+    Returns:
+        list: The "perm" entries of the whole sweep, stored and new.
+    """
+    key = config_key(config)
+    # A point interrupted while its entries were being written is run again; keep the
+    # latest entry of every point and decoder.
+    stored = list({(e["snr_point"], e.get("decoder")): e for e in store.load_points(key)}.values())
+    simpoints = np.asarray(config["sim"]["sweep_vals"]["simpoints"], dtype=np.float64)
+    adaptive = config["sim"]["sweep_vals"].get("adaptive", False)
+
+    def ordered(entries):
+        if adaptive:
+            return sorted(entries, key=lambda entry: entry["snr_point"])
+        return sorted(entries, key=lambda entry: _simpoint_index(simpoints, entry["snr_point"]))
+
+    if progress is not None:
+        for entry in ordered(stored):
+            progress(entry)
+    if store.is_complete(key):
+        return ordered(stored)
+
+    counts = np.zeros(len(simpoints), dtype=np.int64)
+    for entry in stored:
+        idx = _simpoint_index(simpoints, entry["snr_point"])
+        if idx >= 0:
+            counts[idx] += 1
+    skip_points = set(np.flatnonzero(counts >= points_per_snr(config)).tolist())
+    # A point is only skipped once all of its entries are stored.
+    stored = [e for e in stored if adaptive or _simpoint_index(simpoints, e["snr_point"]) in skip_points]
+
+    def persist(entry):
+        if entry["type"] == "perm":
+            store.append_point(key, entry, config)
+        if progress is not None:
+            progress(entry)
+
+    results = run_simulation(config, persist, skip_points, stored)
+    store.mark_complete(key, config)
+    if config["sim"]["save"]["lutsim_enable"]:
+        update_lut(config, store)
+    if adaptive:
+        return results
+    return ordered(stored + results)
@@ -0,0 +1,271 @@
+import math
+import time
+import numpy as np
+from src.simulation.link import LinkSimulator
+from src.simulation.statistics import confidence_interval, relative_half_width, errors_for_precision
+from src.simulation.importance import simulate_point_is
+
+# Wall-clock time an adaptive batch aims for: long enough to amortize the per-batch
+# Python work, short enough to keep progress reports and stopping prompt.
+TARGET_BATCH_SECONDS = 1.0
+MIN_ADAPTIVE_BATCH = 16
+# A batch is at most this multiple of the frames run so far, so that BLER estimates from
+# the first few errors cannot trigger a huge overshooting batch.
+MAX_BATCH_GROWTH = 4
+
+
+def point_done(frames, bit_errors, frame_errors, len_k, config_loop):
+    """
+    True once a point has reached `max_frames`, or has run `num_frames` frames and met its
+    `sim.loop.stop_rule`: `num_errors` frame errors for "errors"; for "wilson" and
+    "clopper_pearson", a relative half-width of at most `ci_rel_width` for both the BLER
+    and the BER interval at `ci_confidence`.
+    """
+    if frames >= int(config_loop["max_frames"]):
+        return True
+    if frames < config_loop["num_frames"]:
+        return False
+    stop_rule = config_loop.get("stop_rule", "errors")
+    if stop_rule == "errors":
+        return frame_errors >= config_loop["num_errors"]
+    target, confidence = config_loop["ci_rel_width"], config_loop["ci_confidence"]
+    return (
+        relative_half_width(frame_errors, frames, confidence, stop_rule) <= target
+        and relative_half_width(bit_errors, frames * len_k, confidence, stop_rule) <= target
+    )
+
+
+def target_errors(config_loop):
+    """
+    Frame errors a point is expected to need under its stop rule, for planning batches.
+    """
+    stop_rule = config_loop.get("stop_rule", "errors")
+    if stop_rule == "errors":
+        return config_loop["num_errors"]
+    return errors_for_precision(config_loop["ci_rel_width"], config_loop["ci_confidence"], stop_rule)
+
+
+def errors_left(frame_errors, config_loop):
+    """
+    Frame errors still expected before a point that is not done can stop. Under the
+    confidence-interval rules this is at least 1: the planned target is met, yet the
+    interval (or the BER interval) is still too wide.
+    """
+    left = target_errors(config_loop) - frame_errors
+    if config_loop.get("stop_rule", "errors") != "errors":
+        left = max(left, 1)
+    return left
+
+
+def batch_frames(batch_idx, config_loop):
+    """
+    Size of batch `batch_idx` of a point: `sim.loop.batch_size`, cut short at `max_frames`.
+    """
+    batch_size = config_loop["batch_size"]
+    return max(0, min(batch_size, int(config_loop["max_frames"]) - batch_idx * batch_size))
+
+
+class AdaptiveBatchSizer:
+    """
+    Picks the size of every next batch of a point from what the point has shown so far.
+
+    The size is the number of frames still expected to be needed: the rest of
+    `num_frames`, and the `errors_left` of the point divided by the observed BLER (the frame
+    count doubles while no error has been seen yet). It is then capped by MAX_BATCH_GROWTH
+    times the frames run so far, by the frames one TARGET_BATCH_SECONDS batch decodes at
+    the measured throughput, by the memory ceiling `sim.loop.max_batch_memory_mb`, and
+    by `max_frames`.
+
+    Args:
+        config_loop (dict): Validated `sim.loop` section; `batch_size` is the first size.
+        frame_bytes (int): Peak memory of one frame, see `LinkSimulator.frame_bytes`.
+    """
+
+    def __init__(self, config_loop, frame_bytes):
+        self.config_loop = config_loop
+        self.max_batch = max(1, config_loop["max_batch_memory_mb"] * 2 ** 20 // frame_bytes)
+        self.fps = None
+
+    def update(self, batch, seconds):
+        """
+        Records the decoding time of a batch; throughput is smoothed over batches.
+        """
+        fps = batch / max(seconds, 1e-9)
+        self.fps = fps if self.fps is None else 0.5 * (self.fps + fps)
+
+    def next_size(self, frames, frame_errors):
+        config_loop = self.config_loop
+        left = int(config_loop["max_frames"]) - frames
+        if self.fps is None:
+            size = config_loop["batch_size"]
+        else:
+            size = max(config_loop["num_frames"] - frames, 0)
+            n_errors = errors_left(frame_errors, config_loop)
+            if n_errors > 0:
+                if frame_errors:
+                    size = max(size, math.ceil(n_errors * frames / frame_errors))
+                else:
+                    size = max(size, frames)
+            size = min(size, MAX_BATCH_GROWTH * frames, max(MIN_ADAPTIVE_BATCH, int(self.fps * TARGET_BATCH_SECONDS)))
+        size = max(size, MIN_ADAPTIVE_BATCH)
+        return max(1, min(size, self.max_batch, left))
+
+
+def progress_entry(snr, frames, bit_errors, frame_errors, len_k, kind, config_loop=None, **extra):
+    """
+    One progress record in the format the UI plots: `snr_point`, `ber`, `bler` and `type`
+    ("temp" while the point runs, "perm" once it is final), plus the raw counters and
+    any `extra` fields such as the batch size used.
+
+    With `config_loop`, the entry also carries `ber_ci` and `bler_ci`, the [lower, upper]
+    intervals at `ci_confidence` (Clopper-Pearson under that stop rule, Wilson otherwise).
+    Bit errors are treated as independent trials for `ber_ci`.
+    """
+    entry = {
+        "snr_point": float(snr),
+        "ber": bit_errors / (frames * len_k) if frames else 0.0,
+        "bler": frame_errors / frames if frames else 0.0,
+        "frames": int(frames),
+        "bit_errors": int(bit_errors),
+        "frame_errors": int(frame_errors),
+        "type": kind,
+    }
+    if config_loop is not None:
+        method = "clopper_pearson" if config_loop.get("stop_rule") == "clopper_pearson" else "wilson"
+        confidence = config_loop.get("ci_confidence", 0.95)
+        entry["ber_ci"] = list(confidence_interval(bit_errors, frames * len_k, confidence, method))
+        entry["bler_ci"] = list(confidence_interval(frame_errors, frames, confidence, method))
+    entry.update(extra)
+    return entry
+
+
+def simulate_point(link, snr_idx, snr, config_loop, progress=None):
+    """
+    Simulates one SNR point in batches of `sim.loop.batch_size` frames until `point_done`,
+    or in batches picked by an AdaptiveBatchSizer with `sim.loop.adaptive_batch`.
+
+    Batch b of point i draws its noise from stream (i, 0, b) of `channel.seed`, so a
+    point's result does not depend on which process runs it. Adaptive sizes follow the
+    measured throughput, so adaptive runs are only reproducible for the same sizes.
+
+    Args:
+        link (LinkSimulator): Link to simulate.
+        snr_idx (int): Index of the point in `simpoints`.
+        snr (float): Point value, in the unit of `sim.sweep_type`.
+        config_loop (dict): Validated `sim.loop` section.
+        progress (callable, optional): Receives a "temp" entry after every batch, with
+            the size of that batch in `batch_size`.
+
+    Returns:
+        dict: The final "perm" progress entry of the point.
+    """
+    noise_var = link.noise_var(snr)
+    sizer = AdaptiveBatchSizer(config_loop, link.frame_bytes()) if config_loop.get("adaptive_batch") else None
+    frames = bit_errors = frame_errors = 0
+    batch_idx = 0
+    while not point_done(frames, bit_errors, frame_errors, link.len_k, config_loop):
+        if sizer is None:
+            batch = batch_frames(batch_idx, config_loop)
+        else:
+            batch = sizer.next_size(frames, frame_errors)
+        rng = link.channel.generator(snr_idx, 0, batch_idx)
+        start = time.perf_counter()
+        n_bit, n_frame = link.run_batch(batch, noise_var, rng)
+        if sizer is not None:
+            sizer.update(batch, time.perf_counter() - start)
+        frames += batch
+        bit_errors += n_bit
+        frame_errors += n_frame
+        batch_idx += 1
+        if progress is not None:
+            progress(
+                progress_entry(snr, frames, bit_errors, frame_errors, link.len_k, "temp", config_loop, batch_size=batch)
+            )
+    return progress_entry(snr, frames, bit_errors, frame_errors, link.len_k, "perm", config_loop)
+
+
+def simulate_point_compare(link, snr_idx, snr, config_loop, progress=None):
+    """
+    Simulates one SNR point for every decoder of `polar.decoders` on shared channel LLRs.
+
+    Every batch is generated once and decoded by each decoder in turn; batches and noise
+    streams are those of `simulate_point`, so each decoder's counts equal a plain run of
+    that decoder alone. The point continues until `point_done` holds for every decoder.
+    Entries carry the decoder in `decoder`; for every decoder after the first (the
+    reference), `discordant_ref` counts frames only the reference failed and
+    `discordant_self` frames only this decoder failed, the paired counts for a
+    McNemar-style comparison.
+
+    Returns:
+        list: The final "perm" entry of every decoder.
+    """
+    noise_var = link.noise_var(snr)
+    n_dec = len(link.compare_decoders)
+    counts = np.zeros((n_dec, 4), dtype=np.int64)  # bit errors, frame errors, discordant ref, discordant self
+    frames = 0
+    batch_idx = 0
+
+    def entries(kind):
+        return [
+            progress_entry(
+                snr, frames, counts[d, 0], counts[d, 1], link.len_k, kind, config_loop,
+                decoder=link.compare_labels[d], discordant_ref=int(counts[d, 2]), discordant_self=int(counts[d, 3]),
+            )
+            for d in range(n_dec)
+        ]
+
+    while not all(point_done(frames, counts[d, 0], counts[d, 1], link.len_k, config_loop) for d in range(n_dec)):
+        batch = batch_frames(batch_idx, config_loop)
+        rng = link.channel.generator(snr_idx, 0, batch_idx)
+        errors = np.array(link.run_batch_compare(batch, noise_var, rng))
+        failed = errors > 0
+        counts[:, 0] += errors.sum(axis=1)
+        counts[:, 1] += failed.sum(axis=1)
+        counts[:, 2] += (failed[0] & ~failed).sum(axis=1)
+        counts[:, 3] += (failed & ~failed[0]).sum(axis=1)
+        frames += batch
+        batch_idx += 1
+        if progress is not None:
+            for entry in entries("temp"):
+                progress(entry)
+    return entries("perm")
+
+
+def run_point(link, snr_idx, snr, config_sim, config_loop=None, progress=None):
+    """
+    Simulates one point in the mode of a validated `sim` section, with `config_loop`
+    replacing `sim.loop` when given. Returns its "perm" progress entry.
+    """
+    config_loop = config_loop or config_sim["loop"]
+    if config_sim["mode"] == "is":
+        return simulate_point_is(link, snr_idx, snr, config_loop, config_sim["importance"], progress)
+    return simulate_point(link, snr_idx, snr, config_loop, progress)
+
+
+def run_sweep(config, progress=None, skip_points=()):
+    """
+    Simulates every point of `sim.sweep_vals.simpoints` in order, with importance
+    sampling when `sim.mode` is "is" and every decoder of `polar.decoders` when it is
+    "compare".
+
+    Points whose index is in `skip_points` are not run.
+
+    Returns:
+        list: The "perm" progress entry of every point (of every decoder and point when
+        comparing), also passed to `progress`.
+    """
+    link = LinkSimulator(config)
+    config_sim = config["sim"]
+    results = []
+    for snr_idx, snr in enumerate(config_sim["sweep_vals"]["simpoints"]):
+        if snr_idx in skip_points:
+            continue
+        if config_sim["mode"] == "compare":
+            entries = simulate_point_compare(link, snr_idx, snr, config_sim["loop"], progress)
+        else:
+            entries = [run_point(link, snr_idx, snr, config_sim, progress=progress)]
+        for entry in entries:
+            if progress is not None:
+                progress(entry)
+            results.append(entry)
+    return results
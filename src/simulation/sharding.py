@@ -0,0 +1,166 @@
+import os
+import math
+import time
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from src.simulation.link import LinkSimulator
+from src.simulation.runner import point_done, progress_entry, batch_frames
+
+# Columns of the shared per-batch table.
+_COL_FRAMES = 0
+_COL_BIT_ERRORS = 1
+_COL_FRAME_ERRORS = 2
+_COL_READY = 3
+
+# Coordinator polling period in seconds.
+POLL_INTERVAL = 0.01
+
+
+def _create_shared(shape, dtype):
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+    arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    arr[...] = 0
+    return shm, arr
+
+
+def _attach_shared(name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _shard_worker(config, layout, worker, num_workers, snr_idx, snr):
+    """
+    Decodes the batches worker, worker + W, worker + 2W, ... of one point until the stop
+    flag is raised, with its counts in the shared per-batch table. The channel LLRs go
+    to one private buffer that every batch of the worker reuses.
+    """
+    link = LinkSimulator(config)
+    config_loop = config["sim"]["loop"]
+    shms, arrays = {}, {}
+    for key, spec in layout.items():
+        shms[key], arrays[key] = _attach_shared(*spec)
+    try:
+        noise_var = link.noise_var(snr)
+        llr_buf = np.empty((config_loop["batch_size"], link.plan.len_n), dtype=np.float64)
+        table, stop = arrays["table"], arrays["stop"]
+        for batch_idx in range(worker, table.shape[0], num_workers):
+            if stop[0]:
+                break
+            batch = batch_frames(batch_idx, config_loop)
+            rng = link.channel.generator(snr_idx, 0, batch_idx)
+            n_bit, n_frame = link.run_batch(batch, noise_var, rng, llr_out=llr_buf[:batch])
+            row = table[batch_idx]
+            row[_COL_FRAMES] = batch
+            row[_COL_BIT_ERRORS] = n_bit
+            row[_COL_FRAME_ERRORS] = n_frame
+            row[_COL_READY] = 1
+    finally:
+        # The views must be released before the segments can be closed.
+        table = stop = row = None
+        arrays.clear()
+        for shm in shms.values():
+            shm.close()
+
+
+class ShardedPointRunner:
+    """
+    Simulates one SNR point with several processes decoding disjoint frame shards.
+
+    Worker w decodes batches w, w + W, w + 2W, ... of the point, demapping into its own
+    reusable (batch_size, N) LLR buffer. Everything the processes exchange lives in
+    `multiprocessing.shared_memory`: a per-batch table of (frames, bit errors, frame
+    errors, ready) counters and a stop flag. Nothing is pickled per batch. The
+    coordinator commits the table in batch order and raises the stop flag at the first
+    batch where `point_done` holds, e.g. when the global `num_errors` or
+    confidence-interval target is reached; workers check the flag before every batch. Batch sizes and noise streams depend only on the batch index, so the result
+    equals `simulate_point`.
+
+    Args:
+        config (dict): Validated configuration.
+        num_workers (int, optional): Processes per point; `sim.loop.num_workers`, or the
+            CPU count if 0.
+    """
+
+    def __init__(self, config, num_workers=None):
+        self.config = config
+        self.config_loop = config["sim"]["loop"]
+        if num_workers is None:
+            num_workers = self.config_loop.get("num_workers", 0)
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.len_k = config["code"]["len_k"]
+
+    def run_point(self, snr_idx, snr, progress=None):
+        """
+        Returns the "perm" progress entry of the point; `progress` receives "temp" entries
+        whenever newly committed batches change the counters.
+        """
+        config_loop = self.config_loop
+        max_batches = math.ceil(int(config_loop["max_frames"]) / config_loop["batch_size"])
+        shapes = {
+            "table": ((max_batches, 4), np.int64),
+            "stop": ((1,), np.int64),
+        }
+        shms, arrays = {}, {}
+        for key, (shape, dtype) in shapes.items():
+            shms[key], arrays[key] = _create_shared(shape, dtype)
+        layout = {key: (shms[key].name,) + shapes[key] for key in shapes}
+        table, stop = arrays["table"], arrays["stop"]
+
+        workers = [
+            mp.Process(
+                target=_shard_worker, args=(self.config, layout, w, self.num_workers, snr_idx, float(snr)), daemon=True
+            )
+            for w in range(self.num_workers)
+        ]
+        frames = bit_errors = frame_errors = 0
+        committed = 0
+        try:
+            for proc in workers:
+                proc.start()
+            done = point_done(frames, bit_errors, frame_errors, self.len_k, config_loop)
+            while not done:
+                advanced = False
+                while not done and committed < max_batches and table[committed, _COL_READY]:
+                    frames += int(table[committed, _COL_FRAMES])
+                    bit_errors += int(table[committed, _COL_BIT_ERRORS])
+                    frame_errors += int(table[committed, _COL_FRAME_ERRORS])
+                    committed += 1
+                    advanced = True
+                    done = point_done(frames, bit_errors, frame_errors, self.len_k, config_loop)
+                if done:
+                    break
+                if advanced and progress is not None:
+                    progress(progress_entry(snr, frames, bit_errors, frame_errors, self.len_k, "temp", config_loop))
+                if not advanced:
+                    failed = [proc.exitcode for proc in workers if proc.exitcode not in (None, 0)]
+                    if failed:
+                        raise RuntimeError(f"A frame shard worker exited with code {failed[0]}.")
+                    time.sleep(POLL_INTERVAL)
+        finally:
+            stop[0] = 1
+            for proc in workers:
+                proc.join()
+            table = stop = None
+            arrays.clear()
+            for shm in shms.values():
+                shm.close()
+                shm.unlink()
+
+        return progress_entry(snr, frames, bit_errors, frame_errors, self.len_k, "perm", config_loop)
+
+    def run(self, progress=None, skip_points=()):
+        """
+        Simulates every point of `sim.sweep_vals.simpoints` in order, each one sharded over
+        the workers, and returns their "perm" progress entries. Points whose index is in
+        `skip_points` are not run.
+        """
+        results = []
+        for snr_idx, snr in enumerate(self.config["sim"]["sweep_vals"]["simpoints"]):
+            if snr_idx in skip_points:
+                continue
+            entry = self.run_point(snr_idx, snr, progress)
+            if progress is not None:
+                progress(entry)
+            results.append(entry)
+        return results
@@ -0,0 +1,123 @@
+import math
+from functools import lru_cache
+from statistics import NormalDist
+
+CI_METHODS = ("wilson", "clopper_pearson")
+
+
+def _z_value(confidence):
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(errors, trials, confidence=0.95):
+    """
+    Wilson score interval of a binomial proportion.
+
+    Returns:
+        tuple: (lower, upper); (0.0, 1.0) without trials.
+    """
+    if trials <= 0:
+        return 0.0, 1.0
+    z = _z_value(confidence)
+    p = errors / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def _betacf(a, b, x):
+    # Continued fraction of the incomplete beta function (modified Lentz).
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 10000):
+        m2 = 2 * m
+        for num in (m * (b - m) * x / ((a + m2 - 1) * (a + m2)), -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1))):
+            d = 1 + num * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1) < 1e-15:
+            break
+    return h
+
+
+def betainc(a, b, x):
+    """
+    Regularized incomplete beta function I_x(a, b).
+    """
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_front) * _betacf(a, b, x) / a
+    return 1 - math.exp(log_front) * _betacf(b, a, 1 - x) / b
+
+
+def _beta_quantile(q, a, b):
+    lo, hi = 0.0, 1.0
+    for _ in range(100):
+        mid = 0.5 * (lo + hi)
+        if betainc(a, b, mid) < q:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+
+def clopper_pearson_interval(errors, trials, confidence=0.95):
+    """
+    Exact (Clopper-Pearson) interval of a binomial proportion, from beta quantiles.
+
+    Returns:
+        tuple: (lower, upper); (0.0, 1.0) without trials.
+    """
+    if trials <= 0:
+        return 0.0, 1.0
+    alpha = 1 - confidence
+    lower = 0.0 if errors == 0 else _beta_quantile(alpha / 2, errors, trials - errors + 1)
+    upper = 1.0 if errors == trials else _beta_quantile(1 - alpha / 2, errors + 1, trials - errors)
+    return lower, upper
+
+
+def confidence_interval(errors, trials, confidence=0.95, method="wilson"):
+    if method == "wilson":
+        return wilson_interval(errors, trials, confidence)
+    if method == "clopper_pearson":
+        return clopper_pearson_interval(errors, trials, confidence)
+    raise ValueError(f"Unsupported interval method: {method}. Valid options are {list(CI_METHODS)}.")
+
+
+def relative_half_width(errors, trials, confidence=0.95, method="wilson"):
+    """
+    Half-width of the interval over the point estimate; infinite without errors.
+    """
+    if errors == 0:
+        return math.inf
+    lower, upper = confidence_interval(errors, trials, confidence, method)
+    return (upper - lower) / 2 / (errors / trials)
+
+
+# Trials per error at which `errors_for_precision` evaluates the interval, deep in the
+# rare-event regime where the relative half-width depends on the errors alone.
+_RARE_TRIALS_PER_ERROR = 10 ** 6
+
+
+@lru_cache(maxsize=None)
+def errors_for_precision(rel_width, confidence=0.95, method="wilson"):
+    """
+    Errors a rare-event point needs for a relative half-width of `rel_width` under
+    `method`, used to plan frame budgets. The search starts from the normal
+    approximation z^2 / w^2, which Wilson and Clopper-Pearson intervals need a few more
+    errors than.
+    """
+    z = _z_value(confidence)
+    errors = max(1, math.ceil(z * z / (rel_width * rel_width)))
+    while relative_half_width(errors, errors * _RARE_TRIALS_PER_ERROR, confidence, method) > rel_width:
+        errors += 1
+    return errors
@@ -0,0 +1,172 @@
+import numpy as np
+
+WORD_DTYPES = (np.uint8, np.uint64)
+
+
+class PackedBits:
+    """
+    A batch of equal-length bit frames stored MSB-first in machine words.
+
+    `words` has shape (..., n_words) with dtype uint8 or uint64. Bit j of a frame is
+    bit 7 - (j % 8) of byte j // 8, the layout of `np.packbits`; uint64 words are the
+    same bytes viewed eight at a time, so switching word size never copies. Padding
+    bits past `len_bits` are always zero, which keeps XOR and popcount exact.
+    """
+
+    def __init__(self, words, len_bits):
+        words = np.asarray(words)
+        if words.dtype.type not in WORD_DTYPES:
+            raise TypeError(f"Packed words must be uint8 or uint64, got {words.dtype}.")
+        if words.shape[-1] * words.dtype.itemsize * 8 < len_bits:
+            raise ValueError(f"{words.shape[-1]} words of {words.dtype} cannot hold {len_bits} bits.")
+        self.words = words
+        self.len_bits = len_bits
+
+    @classmethod
+    def zeros(cls, shape, len_bits, word_dtype=np.uint8):
+        """
+        Returns an all-zero container for frames of `len_bits` bits.
+        """
+        shape = (shape,) if np.isscalar(shape) else tuple(shape)
+        n_words = num_words(len_bits, word_dtype)
+        return cls(np.zeros(shape + (n_words,), dtype=word_dtype), len_bits)
+
+    @classmethod
+    def from_bits(cls, bits, word_dtype=np.uint8, out=None):
+        """
+        Packs a (..., len_bits) array of 0/1 values.
+
+        Args:
+            bits (np.ndarray): Unpacked bits, any integer or bool dtype.
+            word_dtype: np.uint8 or np.uint64.
+            out (PackedBits, optional): Preallocated container to pack into.
+
+        Returns:
+            PackedBits: The packed frames.
+        """
+        bits = np.asarray(bits)
+        len_bits = bits.shape[-1]
+        if out is None:
+            out = cls.zeros(bits.shape[:-1], len_bits, word_dtype)
+        packed = np.packbits(bits.astype(np.bool_, copy=False), axis=-1)
+        byte_view = out.as_bytes()
+        byte_view[..., :packed.shape[-1]] = packed
+        byte_view[..., packed.shape[-1]:] = 0
+        return out
+
+    def to_bits(self, out=None, dtype=np.uint8):
+        """
+        Returns the (..., len_bits) unpacked bits, written into `out` when given.
+        """
+        bits = np.unpackbits(self.as_bytes(), axis=-1, count=self.len_bits)
+        if out is None:
+            return bits if dtype == np.uint8 else bits.astype(dtype)
+        out[...] = bits
+        return out
+
+    def as_bytes(self):
+        """
+        Returns a zero-copy uint8 view of the words.
+        """
+        return self.words.view(np.uint8)
+
+    def as_words(self, word_dtype):
+        """
+        Returns a zero-copy view of the same frames with another word size.
+        The uint64 view requires the byte count to be a multiple of 8, which
+        `zeros` and `from_bits` guarantee for uint64 containers.
+        """
+        return PackedBits(self.words.view(word_dtype), self.len_bits)
+
+    @property
+    def shape(self):
+        return self.words.shape[:-1]
+
+    def __len__(self):
+        return self.words.shape[0]
+
+    def __getitem__(self, index):
+        """
+        Selects frames (leading axes). Slices return views, index arrays return copies.
+        """
+        if isinstance(index, tuple) and len(index) >= self.words.ndim:
+            raise IndexError("Index the bit axis with `take_bits` instead.")
+        return PackedBits(self.words[index], self.len_bits)
+
+    def take_bits(self, positions, word_dtype=None):
+        """
+        Gathers the bit positions `positions` of every frame into a new packed container,
+        e.g. the information set of a polar codeword.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        byte_view = self.as_bytes()
+        bits = (byte_view[..., positions >> 3] >> (7 - (positions & 7)).astype(np.uint8)) & 1
+        return PackedBits.from_bits(bits, word_dtype or self.words.dtype.type)
+
+    def __xor__(self, other):
+        return PackedBits(self.words ^ _words_of(other, self), self.len_bits)
+
+    def __ixor__(self, other):
+        self.words ^= _words_of(other, self)
+        return self
+
+    def popcount(self):
+        """
+        Returns the number of set bits of every frame, shape (...,).
+        """
+        return np.bitwise_count(self.words).sum(axis=-1, dtype=np.int64)
+
+    def any(self):
+        """
+        Returns True for every frame that has at least one set bit.
+        """
+        return self.words.any(axis=-1)
+
+    def __repr__(self):
+        return f"PackedBits(shape={self.shape}, len_bits={self.len_bits}, dtype={self.words.dtype})"
+
+
+def num_words(len_bits, word_dtype=np.uint8):
+    word_bits = np.dtype(word_dtype).itemsize * 8
+    return -(-len_bits // word_bits)
+
+
+def _words_of(other, ref):
+    if isinstance(other, PackedBits):
+        if other.len_bits != ref.len_bits:
+            raise ValueError(f"Cannot combine frames of {ref.len_bits} and {other.len_bits} bits.")
+        if other.words.dtype != ref.words.dtype:
+            return other.words.view(ref.words.dtype)
+        return other.words
+    return other
+
+
+def as_packed(bits, word_dtype=np.uint8):
+    """
+    Returns `bits` unchanged if it is already packed, otherwise packs it.
+    """
+    if isinstance(bits, PackedBits):
+        return bits
+    return PackedBits.from_bits(bits, word_dtype)
+
+
+def count_bit_errors(vec_ref, vec_dec):
+    """
+    Counts the bit errors of every frame with one XOR and popcount per word.
+
+    Args:
+        vec_ref: Reference frames, PackedBits or a (..., len_bits) bit array.
+        vec_dec: Decoded frames, same layout.
+
+    Returns:
+        np.ndarray: int64 bit error count per frame.
+    """
+    return (as_packed(vec_ref) ^ as_packed(vec_dec)).popcount()
+
+
+def count_errors(vec_ref, vec_dec):
+    """
+    Returns (bit errors, frame errors) summed over a batch, the counters behind `ber` and `bler`.
+    """
+    errors = count_bit_errors(vec_ref, vec_dec)
+    return int(errors.sum()), int(np.count_nonzero(errors))
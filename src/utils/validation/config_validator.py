@@ -1,6 +1,11 @@
 import os
 from src.utils.validation.config_validator_polar import *
 from src.utils.validation.validate_keys import *
+from src.modulation.modulation import MOD_BITS, DEMOD_TYPES, LLR_METHODS
+from src.channel.channel import CHANNEL_TYPES
+from src.simulation.link import check_allzero_symmetric
+from src.simulation.statistics import CI_METHODS
+from src.simulation.importance import IS_METHODS
 
 def validate_config_code(config_code):
     required_keys = {
@@ -31,8 +36,20 @@ def validate_config_modulator(config_mod):
     required_keys = {
         "type": str,
     }
+    optional_keys = {
+        "demod_type": (str, "soft"),
+        "llr_method": (str, "maxlog"),
+    }
+
+    validate_required_keys(config_mod, required_keys, "mod")
+    validate_optional_keys(config_mod, optional_keys, "mod")
 
-    validate_required_keys(config_mod, required_keys, "code")
+    if config_mod["type"] not in MOD_BITS:
+        raise ValueError(f"Invalid 'mod.type': {config_mod['type']}. Valid options are {list(MOD_BITS.keys())}.")
+    if config_mod["demod_type"] not in DEMOD_TYPES:
+        raise ValueError(f"Invalid 'mod.demod_type': {config_mod['demod_type']}. Valid options are {list(DEMOD_TYPES)}.")
+    if config_mod["llr_method"] not in LLR_METHODS:
+        raise ValueError(f"Invalid 'mod.llr_method': {config_mod['llr_method']}. Valid options are {list(LLR_METHODS)}.")
 
     return config_mod
 
@@ -47,13 +64,27 @@ def validate_config_channel(config_chn):
         "seed": (int, 42)  # Default value is 42
     }
 
-    validate_required_keys(config_chn, required_keys, "config_chn")
+    validate_required_keys(config_chn, required_keys, "channel")
+    validate_optional_keys(config_chn, optional_keys, "channel")
 
+    if config_chn["type"] not in CHANNEL_TYPES:
+        raise ValueError(f"Invalid 'channel.type': {config_chn['type']}. Valid options are {list(CHANNEL_TYPES)}.")
+    if config_chn["seed"] < 0:
+        raise ValueError(f"'channel.seed' ({config_chn['seed']}) must be a non-negative value.")
 
     return config_chn
 
 
 
+# "rel" and "dev" simulate random codewords; "allzero" sends the all-zero codeword;
+# "is" draws biased noise and weights errors by their likelihood ratio; "compare" decodes
+# the same channel LLRs with every decoder of `polar.decoders`.
+SIM_MODES = ("rel", "dev", "allzero", "is", "compare")
+SWEEP_TYPES = ("SNR", "EbN0")
+PARALLEL_MODES = ("points", "frames")
+STOP_RULES = ("errors",) + CI_METHODS
+
+
 def validate_config_sim(config_sim):
     required_keys = {
         "mode": str,
@@ -70,8 +101,15 @@ def validate_config_sim(config_sim):
     validate_required_keys(config_sim, required_keys, "sim")
     # validate_optional_keys(config_sim, optional_keys, "sim")
 
+    if config_sim["mode"] not in SIM_MODES:
+        raise ValueError(f"Invalid 'sim.mode': {config_sim['mode']}. Valid options are {list(SIM_MODES)}.")
+    if config_sim["sweep_type"] not in SWEEP_TYPES:
+        raise ValueError(f"Invalid 'sim.sweep_type': {config_sim['sweep_type']}. Valid options are {list(SWEEP_TYPES)}.")
+
     config_sim["loop"] = validate_config_sim_loop(config_sim["loop"])
     config_sim["save"] = validate_config_sim_save(config_sim["save"])
+    if config_sim["mode"] == "is":
+        config_sim["importance"] = validate_config_sim_importance(config_sim.get("importance", {}))
 
     if "sweep_vals" in config_sim:
         config_sim["sweep_vals"] = validate_config_sim_snr(config_sim["sweep_vals"])
@@ -87,7 +125,17 @@ def validate_config_sim_snr(config_sim_snr):
         "step": (int, float)
     }
 
+    optional_keys = {
+        "adaptive": (bool, False),  # Refine the grid around target BLERs and bends while running
+        "target_blers": (list, [1e-1, 1e-2, 1e-3]),
+        "max_points": (int, 20),
+        "min_step": ((int, float), 0.1),
+        "budget_frames": (int, 0),  # 0: no frame budget
+        "budget_seconds": ((int, float), 0)  # 0: no time budget
+    }
+
     validate_required_keys(config_sim_snr, required_keys, "sim.snr")
+    validate_optional_keys(config_sim_snr, optional_keys, "sim.sweep_vals")
 
     start = config_sim_snr["start"]
     end = config_sim_snr["end"]
@@ -104,9 +152,38 @@ def validate_config_sim_snr(config_sim_snr):
     config_sim_snr["simpoints"] = np.arange(start, end + step, step, dtype=float)
     config_sim_snr["len_points"] = len(config_sim_snr["simpoints"])
 
+    if any(not 0 < target < 1 for target in config_sim_snr["target_blers"]):
+        raise ValueError(f"'sim.sweep_vals.target_blers' ({config_sim_snr['target_blers']}) must lie between 0 and 1.")
+    for key in ("max_points", "min_step", "budget_frames", "budget_seconds"):
+        if config_sim_snr[key] < 0:
+            raise ValueError(f"'sim.sweep_vals.{key}' ({config_sim_snr[key]}) must be a non-negative value.")
+
     return config_sim_snr
 
 
+def validate_config_sim_importance(config_sim_is):
+    optional_keys = {
+        "method": (str, "shift"),  # Mean shift toward the decision boundaries, or variance scaling
+        "bias": (float, 0.5),      # Per-frame shift in units of the boundary distance, or noise std multiplier
+        "min_ess": (float, 0.1)    # Smallest effective sample size, as a fraction of the frames, to stop at
+    }
+
+    validate_optional_keys(config_sim_is, optional_keys, "sim.importance")
+
+    method = config_sim_is["method"]
+    bias = config_sim_is["bias"]
+    if method not in IS_METHODS:
+        raise ValueError(f"Invalid 'sim.importance.method': {method}. Valid options are {list(IS_METHODS)}.")
+    if method == "shift" and bias < 0:
+        raise ValueError(f"'sim.importance.bias' ({bias}) must be a non-negative value.")
+    if method == "scale" and bias <= 0:
+        raise ValueError(f"'sim.importance.bias' ({bias}) must be a positive value.")
+    if not 0 <= config_sim_is["min_ess"] <= 1:
+        raise ValueError(f"'sim.importance.min_ess' ({config_sim_is['min_ess']}) must be in [0, 1].")
+
+    return config_sim_is
+
+
 def validate_config_ofdm(config_ofdm):
     required_keys = {
         "num_subcarriers": int,  
@@ -115,6 +192,15 @@ def validate_config_ofdm(config_ofdm):
 
     validate_required_keys(config_ofdm, required_keys, "ofdm")
 
+    num_subcarriers = config_ofdm["num_subcarriers"]
+    cyclic_prefix_length = config_ofdm["cyclic_prefix_length"]
+    if num_subcarriers <= 0:
+        raise ValueError(f"'ofdm.num_subcarriers' ({num_subcarriers}) must be a positive value.")
+    if not 0 <= cyclic_prefix_length <= num_subcarriers:
+        raise ValueError(
+            f"'ofdm.cyclic_prefix_length' ({cyclic_prefix_length}) must be between 0 and 'ofdm.num_subcarriers' ({num_subcarriers})."
+        )
+
     return config_ofdm
 
 
@@ -125,6 +211,14 @@ def validate_config_sim_loop(config_sim_loop):
     }
     optional_keys = {
         "max_frames": (int, 1e7),  
+        "batch_size": (int, 256),
+        "num_workers": (int, 0),  # 0: one worker per CPU, 1: serial
+        "parallel": (str, "points"),  # Split the workers over SNR points or over the frames of one point
+        "adaptive_batch": (bool, False),  # Size batches from measured throughput and BLER
+        "max_batch_memory_mb": (int, 1024),
+        "stop_rule": (str, "errors"),  # "errors" (num_errors), or a "wilson" / "clopper_pearson" interval
+        "ci_rel_width": (float, 0.1),  # Target relative half-width of the BLER and BER intervals
+        "ci_confidence": (float, 0.95),
     }
 
     validate_required_keys(config_sim_loop, required_keys, "sim.loop")
@@ -140,6 +234,20 @@ def validate_config_sim_loop(config_sim_loop):
         raise ValueError(f"'sim.loop.num_errors' ({num_errors}) must be a non-negative value.")
     if max_frames < 0:
         raise ValueError(f"'sim.loop.max_frames' ({max_frames}) must be a non-negative value.")
+    if config_sim_loop["batch_size"] <= 0:
+        raise ValueError(f"'sim.loop.batch_size' ({config_sim_loop['batch_size']}) must be a positive value.")
+    if config_sim_loop["num_workers"] < 0:
+        raise ValueError(f"'sim.loop.num_workers' ({config_sim_loop['num_workers']}) must be a non-negative value.")
+    if config_sim_loop["max_batch_memory_mb"] <= 0:
+        raise ValueError(f"'sim.loop.max_batch_memory_mb' ({config_sim_loop['max_batch_memory_mb']}) must be a positive value.")
+    if config_sim_loop["stop_rule"] not in STOP_RULES:
+        raise ValueError(f"Invalid 'sim.loop.stop_rule': {config_sim_loop['stop_rule']}. Valid options are {list(STOP_RULES)}.")
+    if not 0 < config_sim_loop["ci_rel_width"] < 1:
+        raise ValueError(f"'sim.loop.ci_rel_width' ({config_sim_loop['ci_rel_width']}) must be between 0 and 1.")
+    if not 0 < config_sim_loop["ci_confidence"] < 1:
+        raise ValueError(f"'sim.loop.ci_confidence' ({config_sim_loop['ci_confidence']}) must be between 0 and 1.")
+    if config_sim_loop["parallel"] not in PARALLEL_MODES:
+        raise ValueError(f"Invalid 'sim.loop.parallel': {config_sim_loop['parallel']}. Valid options are {list(PARALLEL_MODES)}.")
 
     return config_sim_loop
 
@@ -149,12 +257,40 @@ def validate_config_sim_save(config_sim_save):
     optional_keys = {
         "plot_enable": (bool, False),
         "lutsim_enable": (bool, False),
-        "save_output": (bool, True)
+        "save_output": (bool, True),
+        "results_dir": (str, "results")  # Results store of `save_output`
     }
 
-    validate_optional_keys(config_sim_save, optional_keys, "sim.loop")
+    validate_optional_keys(config_sim_save, optional_keys, "sim.save")
+
+    if config_sim_save["lutsim_enable"] and not config_sim_save["save_output"]:
+        raise ValueError("'sim.save.lutsim_enable' builds its BLER tables from stored results and requires 'sim.save.save_output'.")
     
     # config_sim_save["path_output"]     = f"SC_{os.path.splitext(os.path.basename(filepath))[0]}_k{len_k}.out"
     # config_sim_save["path_fig_output"] = f"SC_{os.path.splitext(os.path.basename(filepath))[0]}_k{len_k}.png"
 
-    return config_sim_save
\ No newline at end of file
+    return config_sim_save
+
+
+
+def validate_config_sim_mode(config):
+    """
+    Cross-section checks of `sim.mode` and `sim.loop` against the code, modulation and
+    sweep sections.
+    """
+    if config["sim"]["mode"] == "allzero":
+        check_allzero_symmetric(config)
+    if config["sim"]["mode"] == "compare":
+        if not config["code"].get("polar", {}).get("decoders"):
+            raise ValueError("'sim.mode' compare needs a non-empty 'polar.decoders' list.")
+        if config["sim"]["sweep_vals"]["adaptive"]:
+            raise ValueError("'sim.mode' compare does not support 'sim.sweep_vals.adaptive'.")
+    if config["sim"]["loop"]["adaptive_batch"]:
+        # Only the serial point runner sizes batches adaptively; the process pool and the
+        # frame shards number fixed-size batches, and "is"/"compare" use fixed sizes too.
+        if config["sim"]["mode"] in ("is", "compare"):
+            raise ValueError(f"'sim.loop.adaptive_batch' is not supported with 'sim.mode' {config['sim']['mode']}.")
+        if config["sim"]["loop"]["num_workers"] != 1 and not config["sim"]["sweep_vals"]["adaptive"]:
+            raise ValueError("'sim.loop.adaptive_batch' needs 'sim.loop.num_workers' 1 (or an adaptive sweep).")
+
+    return config
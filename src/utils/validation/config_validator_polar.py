@@ -14,6 +14,7 @@ def validate_config_polar(config):
     optional_keys = {
         "crc": dict,      # Delegate to `validate_crc_config`
         "decoder": dict,  # Delegate to `validate_decoder_config`
+        "decoders": list,  # Decoders compared by `sim.mode` compare, each like `decoder`
         "quantize": dict,    # Delegate to `validate_quant_config`
         "fast_enable": bool, # Delegate to `fast enable`
         "fast_max_size": dict # Delegate to `fast max size`
@@ -22,7 +23,7 @@ def validate_config_polar(config):
     validate_required_keys(config, required_keys, "polar")
     
     config["rel_idx"] = import_polarcode_file(config["polar_file"])
-    config["len_n"] = config["rel_idx"][0] + 1
+    config["len_n"] = int(config["rel_idx"][0]) + 1
     config["len_logn"] = int(math.log2(config["len_n"]))
 
     # Validate optional nested sections
@@ -30,6 +31,8 @@ def validate_config_polar(config):
         config["crc"] = validate_config_polar_crc(config["crc"])
     if "decoder" in config:
         config["decoder"] = validate_config_polar_decoder(config["decoder"])
+    if "decoders" in config:
+        config["decoders"] = [validate_config_polar_decoder(dec) for dec in config["decoders"]]
     if "quantize" in config:
         config["quantize"] = validate_config_polar_quantize(config["quantize"])
     if "fast_enable" in config:
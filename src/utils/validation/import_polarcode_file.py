@@ -1,15 +1,17 @@
+from src.coding.polar.reliability import import_reliability_sequence
+
 def import_polarcode_file(filepath):
-    vec_polar_rel_idx = []
+    """
+    Returns the reliability sequence of a `polar_file`, most reliable index first.
 
-    try:
-        with open(filepath, 'r') as file:
-            # Read each line from the file and append it to the vector
-            for line in file:
-                values = line.split()
-                vec_polar_rel_idx.extend([int(x) for x in values])
-    except FileNotFoundError:
-        print(f"Error: File '{filepath}' not found.")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+    3GPP lengths (n32_3gpp.pc, n64_3gpp.pc, ...) are derived from the master sequence in
+    the binary reliability store, and files indexed in the store are read from it.
+    Gaussian-approximation names (n64_awgn_ga2.5dB.pc, ...) missing on disk are
+    constructed in memory; only other `.pc` files are parsed as text. The result is
+    cached and read-only.
 
-    return vec_polar_rel_idx
\ No newline at end of file
+    Raises:
+        FileNotFoundError: If the file is neither in the store nor on disk.
+        ValueError: If the sequence is not a valid polar reliability ordering.
+    """
+    return import_reliability_sequence(filepath)
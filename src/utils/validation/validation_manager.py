@@ -26,4 +26,4 @@ def validate_config(config):
         if section not in config:
             raise ValueError(f"Missing required configuration section: '{section}'")
         validated_config[section] = validator(config[section])
-    return validated_config
\ No newline at end of file
+    return validate_config_sim_mode(validated_config)
\ No newline at end of file